@@ -0,0 +1,223 @@
+"""
+Offline benchmark suite for the job scanner pipeline.
+
+For each corpus size a local stand-in server (see stand_in_server.py) is started and a fresh child
+process runs the pipeline against it, so peak RSS is measured per size. Reported per stage: wall
+time and throughput; for fetch stages also request count, p50/p95 request latency and bytes
+received. Results are written as JSON so runs can be compared.
+
+Examples:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000 --output bench.json
+    python benchmarks/run_benchmarks.py --latency-ms 80 --error-rate 0.05 --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stand_in_server import Corpus, bench_finder, load_fixtures, point_config_at, start  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+RESULT_MARKER = "BENCH_RESULT "
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class _RequestRecorder:
+    """Wraps http_client.get to record per-request latency and payload size."""
+
+    def __init__(self):
+        import http_client
+        self._module = http_client
+        self._original = http_client.get
+        self.latencies = []
+        self.bytes = 0
+
+    def __enter__(self):
+        def recorded_get(url, **kwargs):
+            start = time.perf_counter()
+            resp = self._original(url, **kwargs)
+            self.latencies.append(time.perf_counter() - start)
+            self.bytes += len(resp.content)
+            return resp
+        self._module.get = recorded_get
+        return self
+
+    def __exit__(self, *exc):
+        self._module.get = self._original
+
+    def summary(self):
+        return {
+            "requests": len(self.latencies),
+            "p50_ms": round(_percentile(self.latencies, 0.50) * 1000, 2) if self.latencies else None,
+            "p95_ms": round(_percentile(self.latencies, 0.95) * 1000, 2) if self.latencies else None,
+            "bytes": self.bytes,
+        }
+
+
+def _stage(stages, name, items_fn, fn, recorder=None):
+    """Run one stage quietly, recording wall time and throughput."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn()
+        wall = time.perf_counter() - start
+    items = items_fn(result)
+    stages[name] = {
+        "wall_s": round(wall, 4),
+        "items": items,
+        "throughput_per_s": round(items / wall, 1) if wall > 0 else None,
+    }
+    if recorder is not None:
+        stages[name].update(recorder.summary())
+    return result
+
+
+def run_child(base_url, size, limit, fetch_modes):
+    """Measure every pipeline stage against the stand-in at base_url (runs in a child process)."""
+    import cache_utils
+    from job_finder import JobFinder
+    from job_scanner import _save_to_csv
+
+    point_config_at(base_url)
+    workdir = tempfile.mkdtemp(prefix="job_bench_")
+    cache_utils.CACHE_FOLDER = os.path.join(workdir, "cache")
+
+    stages = {}
+    finder = bench_finder(limit)
+    for mode in fetch_modes:
+        with _RequestRecorder() as recorder:
+            _stage(stages, f"aggregate_{mode}", lambda _: len(finder.get_raw()),
+                   lambda: finder.aggregate(mode=mode), recorder)
+
+    raw_count = len(finder.get_raw())
+    matched = _stage(stages, "filter_and_dedupe", lambda r: raw_count, finder.filter_and_dedupe)
+    for sort_by, preferences in (("location", finder.locations), ("keyword", finder.keywords),
+                                 ("published at", [])):
+        _stage(stages, f"sort_{sort_by.replace(' ', '_')}", len,
+               lambda: JobFinder.sort_by_preference(matched, sort_by, preferences))
+    csv_path = os.path.join(workdir, "jobs.csv")
+    _stage(stages, "save_to_csv", lambda _: len(matched), lambda: _save_to_csv(matched, csv_path))
+
+    return {
+        "size": size,
+        "raw_postings": raw_count,
+        "matched": len(matched),
+        "stages": stages,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_size(size, args):
+    """Start a stand-in for `size` postings and measure the pipeline in a fresh interpreter."""
+    corpus = Corpus(size, args.description_bytes, load_fixtures(args.fixtures))
+    server, base_url = start(corpus, latency_ms=args.latency_ms, error_rate=args.error_rate, seed=args.seed)
+    try:
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", "--base-url", base_url,
+               "--child-size", str(size), "--limit", str(args.limit), "--fetch-modes", *args.fetch_modes]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(f"Benchmark for size {size} failed:\n{proc.stderr}")
+
+
+def compare(current, baseline):
+    """Print per-stage wall-time deltas against a previous results file."""
+    previous = {r["size"]: r for r in baseline.get("results", [])}
+    for result in current["results"]:
+        before = previous.get(result["size"])
+        if not before:
+            continue
+        print(f"\nsize={result['size']}")
+        for name, stage in result["stages"].items():
+            old = before["stages"].get(name)
+            if not old or not old["wall_s"]:
+                continue
+            change = (stage["wall_s"] - old["wall_s"]) / old["wall_s"] * 100
+            print(f"  {name:<22} {old['wall_s']:>9.4f}s -> {stage['wall_s']:>9.4f}s  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the job scanner against a local stand-in.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--description-bytes", type=int, default=800)
+    parser.add_argument("--fixtures", help="Directory with recorded <source>.json item lists (airtable.json: "
+                                           "a recorded shared-view response)")
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--fetch-modes", nargs="+", default=["threads", "async"], choices=["threads", "async"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Previous JSON results to diff against")
+    # Internal: run a single measurement in this process
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--child-size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_child(args.base_url, args.child_size, args.limit, args.fetch_modes)
+        print(RESULT_MARKER + json.dumps(result))
+        return
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "description_bytes": args.description_bytes,
+            "limit": args.limit,
+        },
+        "results": [],
+    }
+    for size in args.sizes:
+        print(f"Benchmarking {size} postings...")
+        result = run_size(size, args)
+        results["results"].append(result)
+        for name, stage in result["stages"].items():
+            extra = f"  p50={stage['p50_ms']}ms p95={stage['p95_ms']}ms req={stage['requests']}" if "requests" in stage else ""
+            print(f"  {name:<22} {stage['wall_s']:>9.4f}s  {stage['throughput_per_s'] or 0:>12.1f}/s{extra}")
+        print(f"  peak RSS: {result['peak_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.output}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Local HTTP stand-in for every job source used by JobFinder.
+
+Serves Remotive, Adzuna, RemoteOK, Arbeitnow and the Goonzile/Airtable handshake + table with
+synthetic postings (or postings cloned from recorded responses), with configurable latency and
+error injection. Postings are generated on demand from their index, so even 100k-posting runs
+don't need the whole corpus in memory.
+
+Run standalone:
+    python benchmarks/stand_in_server.py --postings 10000 --latency-ms 50 --error-rate 0.02
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config  # noqa: E402
+from job_finder import JobFinder  # noqa: E402
+
+# The query every benchmark run issues; the corpus is split across the requests it produces
+BENCH_KEYWORDS = ["software engineer", "developer", "data scientist", "devops engineer", "intern"]
+BENCH_LEVELS = ["junior", "intern", "senior"]
+BENCH_LOCATIONS = ["usa", "uk", "germany", "tel aviv", "remote"]
+
+ADZUNA_PAGE_SIZE = 50
+ARBEITNOW_PAGE_SIZE = 100
+MAX_PAGES = 9
+
+TITLES = [
+    "Junior Software Engineer", "Senior Backend Developer", "Data Scientist Intern", "DevOps Engineer",
+    "Software Engineering Intern", "Frontend Developer", "Account Manager", "Sales Development Representative",
+    "Cloud Platform Engineer", "Product Designer", "QA Automation Engineer", "Customer Success Lead",
+]
+LOCATIONS = ["USA", "New York, US", "London, UK", "Berlin, Germany", "Remote", "Worldwide", "tel aviv"]
+WORDS = ("python java cloud team product build scale data platform services customers growth remote "
+         "engineering design develop deploy monitor test review ship mentor learn").split()
+
+
+def _description(i, size):
+    rng = random.Random(i)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return "<p>" + " ".join(words) + "</p>"
+
+
+def _stable_offset(*parts):
+    """Per-query id offset that is stable across processes (unlike hash())."""
+    return zlib.crc32(json.dumps(parts).encode("utf-8")) % 1_000_000 * 1000
+
+
+def bench_finder(limit=300):
+    return JobFinder(BENCH_KEYWORDS, BENCH_LEVELS, BENCH_LOCATIONS, limit=limit)
+
+
+def _date(i):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_700_000_000 + (i * 7919) % 10_000_000))
+
+
+class Corpus:
+    """
+    Deterministic postings split across the sources of the benchmark query.
+
+    Shares: 25% RemoteOK dump, 15% Airtable table, up to 9 pages of Arbeitnow, Adzuna capped at
+    9 pages per (keyword, location) query and the remainder spread over Remotive keyword searches.
+    """
+
+    def __init__(self, postings, description_bytes=800, fixtures=None):
+        finder = bench_finder()
+        keywords = finder.keywords
+        adzuna_queries = len(list(finder._adzuna_queries()))
+        self.postings = postings
+        self.description_bytes = description_bytes
+        self.fixtures = fixtures or {}
+        self.remoteok = int(postings * 0.25)
+        self.goonzile = int(postings * 0.15)
+        self.arbeitnow = min(int(postings * 0.10), MAX_PAGES * ARBEITNOW_PAGE_SIZE)
+        remaining = postings - self.remoteok - self.goonzile - self.arbeitnow
+        self.adzuna = min(remaining // 2 // max(adzuna_queries, 1), MAX_PAGES * ADZUNA_PAGE_SIZE)
+        remaining -= self.adzuna * adzuna_queries
+        self.remotive = max(remaining // max(len(keywords), 1), 0)
+
+    def _base(self, source, i):
+        """Common fields for posting i of a source, optionally cloned from a recorded item."""
+        recorded = self.fixtures.get(source)
+        if recorded:
+            return dict(recorded[i % len(recorded)])
+        return None
+
+    def remotive_jobs(self, kw):
+        offset = _stable_offset("remotive", kw)
+        jobs = []
+        for i in range(self.remotive):
+            job = self._base("remotive", i) or {
+                "title": TITLES[i % len(TITLES)],
+                "candidate_required_location": LOCATIONS[i % len(LOCATIONS)],
+                "date": _date(i),
+                "description": _description(i, self.description_bytes),
+                "company_name": f"Company {i % 997}",
+            }
+            job["url"] = f"https://remotive.example/{offset + i}"
+            jobs.append(job)
+        return jobs
+
+    def adzuna_page(self, country, what, where, page):
+        offset = _stable_offset("adzuna", country, what, where)
+        start = (page - 1) * ADZUNA_PAGE_SIZE
+        results = []
+        for i in range(start, min(start + ADZUNA_PAGE_SIZE, self.adzuna)):
+            job = self._base("adzuna", i) or {
+                "title": TITLES[(i + 3) % len(TITLES)],
+                "location": {"display_name": LOCATIONS[(i + 1) % len(LOCATIONS)]},
+                "created": _date(i),
+                "description": _description(i, self.description_bytes),
+                "company": {"display_name": f"Company {i % 997}"},
+            }
+            job["redirect_url"] = f"https://adzuna.example/{offset + i}"
+            results.append(job)
+        return {"count": self.adzuna, "results": results}
+
+    def remoteok_dump(self):
+        items = [{"legal": "Stand-in RemoteOK feed"}]
+        for i in range(self.remoteok):
+            item = self._base("remoteok", i) or {
+                "position": TITLES[(i + 5) % len(TITLES)],
+                "date": _date(i),
+                "description": _description(i, self.description_bytes),
+                "company": f"Company {i % 997}",
+                "location": LOCATIONS[(i + 2) % len(LOCATIONS)],
+            }
+            item["url"] = f"https://remoteok.example/{i}"
+            items.append(item)
+        return items
+
+    def arbeitnow_page(self, page):
+        start = (page - 1) * ARBEITNOW_PAGE_SIZE
+        data = []
+        for i in range(start, min(start + ARBEITNOW_PAGE_SIZE, self.arbeitnow)):
+            job = self._base("arbeitnow", i) or {
+                "title": TITLES[(i + 7) % len(TITLES)],
+                "location": "Berlin, Germany",
+                "published_at": 1_700_000_000 + i,
+                "description": _description(i, self.description_bytes),
+                "company_name": f"Company {i % 997}",
+            }
+            job["url"] = f"https://arbeitnow.example/{i}"
+            data.append(job)
+        return {"data": data}
+
+    def airtable_table(self):
+        recorded = self.fixtures.get("airtable")
+        if recorded:
+            return self._recorded_airtable_table(recorded)
+        city_ids = list(config.ID_TO_CITY) + ["selUnknownCity"]
+        columns = [{"id": f"fld{i}", "name": name} for i, name in
+                   enumerate(["Job Title", "Position Link", "Company", "Location", "Job Description"])]
+        rows = []
+        for i in range(self.goonzile):
+            rows.append({
+                "id": f"rec{i}",
+                "createdTime": _date(i),
+                "cellValuesByColumnId": {
+                    "fld0": TITLES[(i + 1) % len(TITLES)],
+                    "fld1": f"https://goonzile.example/{i}",
+                    "fld2": f"Company {i % 997}",
+                    "fld3": [city_ids[i % len(city_ids)]],
+                    "fld4": [{"text": _description(i, self.description_bytes)}],
+                },
+            })
+        return {"data": {"table": {"columns": columns, "rows": rows}}}
+
+    def _recorded_airtable_table(self, recorded):
+        """
+        Replay a recorded shared-view response: its columns as-is and its rows cloned up to the
+        Airtable share, each with a unique id and position link.
+        """
+        table = recorded.get("data", recorded).get("table", recorded)
+        link_columns = [col["id"] for col in table["columns"] if col["name"] == "Position Link"]
+        rows = []
+        for i in range(self.goonzile):
+            source_row = table["rows"][i % len(table["rows"])]
+            cells = dict(source_row.get("cellValuesByColumnId", {}))
+            for column in link_columns:
+                cells[column] = f"https://goonzile.example/{i}"
+            rows.append(dict(source_row, id=f"rec{i}", cellValuesByColumnId=cells))
+        return {"data": {"table": {"columns": table["columns"], "rows": rows}}}
+
+
+EMBED_PAGE = (
+    '<script>urlWithParams: "\\u002Fv0.3\\u002Fview\\u002FviwStandIn\\u002FreadSharedViewData?stringifiedObjectParams=x",\n'
+    'earlyPrefetchSpan: null; var headers = {"x-airtable-application-id": "appStandIn", '
+    '"x-airtable-page-load-id": "pglStandIn"}; headers[\'x-time-zone\'] = "UTC";</script>'
+)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    corpus = None
+    latency = 0.0
+    error_rate = 0.0
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, content_type="application/json", headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.rng_lock:
+            fail = self.rng.random() < self.error_rate
+        if fail:
+            # Alternate between throttling and server errors; both are retryable
+            if self.rng.random() < 0.5:
+                self._send(429, {"error": "rate limited"}, headers={"Retry-After": "0"})
+            else:
+                self._send(503, {"error": "unavailable"})
+            return
+
+        parsed = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        parts = parsed.path.strip("/").split("/")
+
+        if parts[0] == "remotive":
+            self._send(200, {"jobs": self.corpus.remotive_jobs(params.get("search", ""))})
+        elif parts[0] == "adzuna" and len(parts) == 3:
+            self._send(200, self.corpus.adzuna_page(parts[1], params.get("what"), params.get("where"), int(parts[2])))
+        elif parts[0] == "remoteok":
+            self._send(200, self.corpus.remoteok_dump())
+        elif parts[0] == "arbeitnow":
+            self._send(200, self.corpus.arbeitnow_page(int(params.get("page", 1))))
+        elif parts[0] == "embed":
+            self._send(200, EMBED_PAGE.encode("utf-8"), content_type="text/html")
+        elif parts[0] == "v0.3":
+            self._send(200, self.corpus.airtable_table())
+        else:
+            self._send(404, {"error": f"unknown path {parsed.path}"})
+
+
+def load_fixtures(directory):
+    """
+    Load recorded per-source item lists from <directory>/<source>.json, if present.
+    airtable.json holds a recorded readSharedViewData response (or just its 'data.table').
+    """
+    fixtures = {}
+    if not directory:
+        return fixtures
+    for source in ("remotive", "adzuna", "remoteok", "arbeitnow", "airtable"):
+        path = os.path.join(directory, f"{source}.json")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                fixtures[source] = json.load(f)
+    return fixtures
+
+
+def start(corpus, host="127.0.0.1", port=0, latency_ms=0, error_rate=0.0, seed=0):
+    """Start the stand-in on a daemon thread and return (server, base_url)."""
+    handler = type("Handler", (StandInHandler,), {
+        "corpus": corpus, "latency": latency_ms / 1000, "error_rate": error_rate, "rng": random.Random(seed),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def point_config_at(base_url):
+    """Redirect every source URL in config to the stand-in."""
+    config.REMOTIVE_API_URL = f"{base_url}/remotive"
+    config.ADZUNA_API_URL_TEMPLATE = base_url + "/adzuna/{country}/{page}"
+    config.REMOTEOK_API_URL = f"{base_url}/remoteok"
+    config.ARBEITNOW_API_URL = f"{base_url}/arbeitnow"
+    config.GOONZILE_IFRAME_URL = f"{base_url}/embed"
+    config.GOONZILE_BASE_URL = base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic job-source responses locally.")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--postings", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--description-bytes", type=int, default=800)
+    parser.add_argument("--fixtures", help="Directory with recorded <source>.json item lists (airtable.json: "
+                                           "a recorded shared-view response)")
+    args = parser.parse_args()
+
+    corpus = Corpus(args.postings, args.description_bytes, load_fixtures(args.fixtures))
+    server, base_url = start(corpus, port=args.port, latency_ms=args.latency_ms, error_rate=args.error_rate)
+    print(f"Stand-in serving ~{args.postings} postings at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
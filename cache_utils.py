@@ -1,37 +1,191 @@
 import os
+import gzip
 import json
+import time
 import hashlib
-from datetime import datetime, timedelta
+import tempfile
+import threading
+from collections import OrderedDict
 
 CACHE_FOLDER = ".job_cache"
 CACHE_TTL_MINUTES = 15
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # On-disk budget; least recently used entries are evicted beyond it
+CACHE_EVICT_TO = 0.8  # Eviction frees space down to this fraction of the budget
+CACHE_COMPRESS_LEVEL = 3
+MEMORY_CACHE_MAX_ENTRIES = 512  # Decoded entries kept in process, in front of the disk
+CACHE_TOUCH_SECONDS = 60  # Memory hits refresh the entry's mtime on disk at most this often
 
+# Per-source freshness; sources missing here fall back to CACHE_TTL_MINUTES
+SOURCE_TTL_MINUTES = {
+    "remotive": 15,
+    "adzuna": 30,
+    "remoteok": 10,
+    "arbeitnow": 30,
+    "goonzile": 60,
+}
 
-def get_cache_key(keywords, secondary_keywords, locations, limit):
-    raw = json.dumps([keywords, secondary_keywords, locations, limit], sort_keys=True)
-    return hashlib.md5(raw.encode()).hexdigest()
 
+def get_fragment_key(source, *parts):
+    """Key for one upstream request, e.g. ("adzuna", keyword, location, country, page)."""
+    raw = json.dumps([source, *parts], sort_keys=True)
+    return f"{source}_{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def get_source_ttl(source):
+    return SOURCE_TTL_MINUTES.get(source, CACHE_TTL_MINUTES)
+
+
+# Decoded entries by path: path -> [saved_at, data, last access, last mtime refresh], most recently used last
+_memory = OrderedDict()
+_memory_lock = threading.Lock()
+# Approximate bytes on disk per cache folder, so the folder is only rescanned when over budget
+_disk_usage = {}
+_disk_lock = threading.Lock()
+
+
+def _entry_path(cache_key):
+    return os.path.abspath(os.path.join(CACHE_FOLDER, f"{cache_key}.json.gz"))
+
+
+def _remember(path, saved_at, data):
+    now = time.time()
+    with _memory_lock:
+        _memory[path] = [saved_at, data, now, now]
+        _memory.move_to_end(path)
+        while len(_memory) > MEMORY_CACHE_MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def load_cache(cache_key, ttl_minutes=CACHE_TTL_MINUTES):
+    """
+    Return the data cached under `cache_key`, or None if it is missing or older than `ttl_minutes`.
+
+    The in-process tier is checked first. On disk, the first line of an entry holds its timestamp,
+    so stale entries are rejected without decompressing the payload. Hits refresh the entry's
+    mtime, which is what eviction orders by (throttled for memory hits, whose last access is also
+    kept in process so eviction here sees it immediately).
+    """
+    path = _entry_path(cache_key)
+    max_age = ttl_minutes * 60
+    now = time.time()
+    touch = False
+    with _memory_lock:
+        entry = _memory.get(path)
+        if entry is not None:
+            _memory.move_to_end(path)
+            entry[2] = now
+            if now - entry[3] > CACHE_TOUCH_SECONDS:
+                entry[3] = now
+                touch = True
+    if entry is not None and now - entry[0] <= max_age:
+        if touch:
+            try:
+                os.utime(path)  # So other processes sharing the folder see it as recently used
+            except OSError:
+                pass
+        return entry[1]
 
-def load_cache(cache_key):
-    path = os.path.join(CACHE_FOLDER, f"{cache_key}.json")
-    if not os.path.exists(path):
-        return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            content = json.load(f)
-        timestamp = datetime.fromisoformat(content["timestamp"])
-        if datetime.utcnow() - timestamp > timedelta(minutes=CACHE_TTL_MINUTES):
-            return None
-        return content["data"]
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            saved_at = json.loads(f.readline())["timestamp"]
+            if time.time() - saved_at > max_age:
+                return None
+            data = json.load(f)
+        os.utime(path)
     except Exception:
+        # Missing, evicted mid-read, or corrupt: all plain misses
         return None
 
+    _remember(path, saved_at, data)
+    return data
+
 
 def save_cache(cache_key, data):
-    os.makedirs(CACHE_FOLDER, exist_ok=True)
-    path = os.path.join(CACHE_FOLDER, f"{cache_key}.json")
+    """
+    Cache `data` under `cache_key` in memory and on disk.
+
+    The entry is written compressed to a temporary file and renamed into place, so concurrent
+    readers - in this or another process - see either the previous entry or the complete new one.
+    """
+    saved_at = time.time()
+    path = _entry_path(cache_key)
+    _remember(path, saved_at, data)
+
+    tmp_path = None
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump({"timestamp": datetime.utcnow().isoformat(), "data": data}, f)
+        os.makedirs(CACHE_FOLDER, exist_ok=True)
+        payload = json.dumps({"timestamp": saved_at}) + "\n" + json.dumps(data)
+        blob = gzip.compress(payload.encode("utf-8"), compresslevel=CACHE_COMPRESS_LEVEL)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_FOLDER, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+        tmp_path = None
     except Exception as e:
         print(f"❌ Failed to write cache: {e}")
+        return
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    _account(len(blob))
+
+
+def _account(size):
+    """Add a written entry to the folder's usage and evict if it goes over budget."""
+    with _disk_lock:
+        folder = os.path.abspath(CACHE_FOLDER)
+        if folder not in _disk_usage:
+            _disk_usage[folder] = _scan(folder)[1]
+        _disk_usage[folder] += size
+        if _disk_usage[folder] > CACHE_MAX_BYTES:
+            _disk_usage[folder] = _evict(folder)
+
+
+def _scan(folder):
+    """Return ([(mtime, size, path)], total_bytes) for the files in the cache folder."""
+    entries = []
+    total = 0
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if entry.is_file():
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+    except OSError:
+        pass
+    return entries, total
+
+
+def _evict(folder):
+    """
+    Delete least recently used entries until the folder is under CACHE_EVICT_TO of the budget.
+    The folder is rescanned, so entries written by other processes are accounted for too.
+
+    Returns:
+        int: Bytes left on disk.
+    """
+    entries, total = _scan(folder)
+    with _memory_lock:
+        # Memory hits since the last mtime refresh count as uses too
+        entries = [(max(mtime, _memory[path][2]) if path in _memory else mtime, size, path)
+                   for mtime, size, path in entries]
+    target = CACHE_MAX_BYTES * CACHE_EVICT_TO
+    for mtime, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue  # Already removed by another process
+        total -= size
+        with _memory_lock:
+            _memory.pop(path, None)
+    return total
@@ -1,13 +1,79 @@
 # === REMOTIVE CONFIGURATION ==============
 REMOTIVE_API_URL = "https://remotive.com/api/remote-jobs"
 
+# === REMOTEOK / ARBEITNOW CONFIGURATION ==
+REMOTEOK_API_URL = "https://remoteok.com/api"
+ARBEITNOW_API_URL = "https://www.arbeitnow.com/api/job-board-api"
+ARBEITNOW_PAGE_SIZE = 100  # Jobs per Arbeitnow board page, used to derive the page ceiling
+
+# === FETCH ENGINE CONFIGURATION ==========
+MAX_CONCURRENCY = 16  # Global cap on in-flight requests in async aggregation mode
+PAGINATION_WINDOW = 4  # Pages of one paginated query requested concurrently
+
+# === JOB RECORD CONFIGURATION ============
+DESCRIPTION_COMPRESS_MIN_CHARS = 1024  # Full descriptions at least this long are kept deflate-compressed
+NEAR_DUPLICATE_THRESHOLD = 0.8  # Estimated description similarity above which postings are merged
+
+# === RELEVANCE RANKING CONFIGURATION =====
+BM25_K1 = 1.2  # Term frequency saturation
+BM25_B = 0.75  # Document length normalization
+BM25_TITLE_WEIGHT = 3  # A title term counts this many times a description term
+
+# === EXPORT CONFIGURATION ================
+EXPORT_CHUNK_ROWS = 1000  # Rows serialized per write
+EXPORT_BUFFER_BYTES = 1024 * 1024  # Write buffer of the output file
+EXPORT_GZIP_LEVEL = 6  # For .gz outputs
+
+# === JOB STORE CONFIGURATION =============
+STORE_FULL_REFRESH_HOURS = 24  # Incremental refreshes walk the full result set at least this often
+STORE_EXPIRE_HOURS = 72  # Stored postings not seen for this long are dropped as gone
+
+# === HTTP TRANSPORT CONFIGURATION ========
+HTTP_POOL_CONNECTIONS = 10  # Number of per-host connection pools kept alive
+HTTP_POOL_MAXSIZE = MAX_CONCURRENCY  # Keep-alive connections per host
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5  # Seconds; doubles on every retry
+HTTP_BACKOFF_JITTER = 0.3  # Seconds of random jitter added to each backoff
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_CONNECT_TIMEOUT = 5  # Seconds
+HTTP_READ_TIMEOUT = 20  # Seconds between bytes; per-source overrides below
+SOURCE_READ_TIMEOUTS = {
+    "remoteok": 45,  # Whole board in one response
+    "goonzile": 45,  # Whole Airtable view in one response
+}
+# Deadlines per source within a latency budget (job_scanner budget_seconds); capped by the budget
+SOURCE_DEADLINE_SECONDS = {
+    "remotive": 10,
+    "adzuna": 15,
+    "remoteok": 10,
+    "arbeitnow": 10,
+    "goonzile": 10,
+}
+BUDGET_COLLECT_SECONDS = 0.25  # End of the budget reserved for collecting what arrived before the deadlines
+
+# === PER-HOST RATE LIMITS ================
+# host -> (requests per second, burst, max requests in flight); the in-flight cap adapts below the max
+HOST_RATE_LIMITS = {
+    "api.adzuna.com": (2, 4, 4),
+    "remoteok.com": (1, 2, 2),
+    "remotive.com": (2, 4, 4),
+    "www.arbeitnow.com": (2, 4, 4),
+    "airtable.com": (2, 4, 2),
+}
+DEFAULT_HOST_RATE_LIMIT = (1000, 100, MAX_CONCURRENCY)  # Unlisted hosts (e.g. local stand-ins)
+RATE_LIMIT_LATENCY_FACTOR = 3  # Latency this many times the best seen counts as congestion...
+RATE_LIMIT_LATENCY_FLOOR = 0.5  # ...once it is also above this many seconds
+
 # === ADZUNA CONFIGURATION ================
 ADZUNA_API_URL_TEMPLATE = "https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
 ADZUNA_APP_ID = "35fb2824"
 ADZUNA_APP_KEY = "ff638f97d7ed3087a321e069ea4403df"
+ADZUNA_PAGE_SIZE = 50  # results_per_page requested from Adzuna
 
 
 # === GOONZILE (AIRTABLE) CONFIGURATION ===
+GOONZILE_BASE_URL = "https://airtable.com"
+GOONZILE_HANDSHAKE_TTL_MINUTES = 12 * 60  # Scraped share URL/headers are refreshed sooner if rejected
 GOONZILE_IFRAME_URL = "https://airtable.com/embed/appwewqLk7iUY4azc/shrQBuWjXd0YgPqV6/tblnk93ouV3B2ce9b?viewControls=on"
 GOONZILE_IFRAME_URL_START = 'urlWithParams: '
 GOONZILE_IFRAME_URL_END = 'earlyPrefetchSpan:'
@@ -89,3 +155,6 @@ normalized_cites_map = {
     "yavne": ["selGwaf1r7pVKjqo1"],
     "yokne'am": ["selmgV10E0kALV9ev"]
 }
+
+# Reverse lookup used when parsing Airtable rows, built once at import
+ID_TO_CITY = {city_id: city for city, ids in normalized_cites_map.items() for city_id in ids}
@@ -0,0 +1,155 @@
+import re
+
+import config
+
+_TAGS = re.compile(r'<[^>]+>')
+_WORDS = re.compile(r'\w+')
+
+# MinHash / LSH parameters: 64 one-permutation bins split into 16 bands of 4 rows, which makes
+# pairs above roughly 0.5 Jaccard likely to share a bucket.
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+SHINGLE_SIZE = 3
+MAX_WORDS = 400  # Only the head of long descriptions is sketched
+MIN_WORDS = 8  # Shorter descriptions carry too little signal to compare
+MAX_BUCKET_COMPARISONS = 4  # Each bucket member is compared with at most this many earlier members
+
+
+def _normalize(text):
+    return " ".join(_WORDS.findall(str(text or "").lower()))
+
+
+def _title(job, company):
+    """Normalized title, without the ' at <company>' suffix some sources append."""
+    title = _normalize(job.get("Description", ""))
+    suffix = f" at {company}" if company else ""
+    if suffix and title.endswith(suffix):
+        title = title[:-len(suffix)]
+    return title
+
+
+def fingerprint(job):
+    """Exact-duplicate key: normalized title + company + location."""
+    company = _normalize(job.get("Company", ""))
+    return _title(job, company), company, _normalize(job.get("Location", ""))
+
+
+def minhash(text):
+    """
+    One-permutation MinHash signature of the word shingles of `text` (HTML tags stripped).
+
+    Each shingle is hashed once and assigned to one of NUM_BINS bins by its low bits; a bin keeps
+    its minimum. Empty bins borrow from the next non-empty bin so short texts stay comparable.
+
+    Returns:
+        Tuple[int] | None: The signature, or None if the text is too short to sketch.
+    """
+    words = _TAGS.sub(" ", text).lower().split()[:MAX_WORDS]
+    if len(words) < MIN_WORDS:
+        return None
+
+    # Visiting hashes in descending order leaves each bin holding its minimum
+    hashes = sorted(set(map(hash, zip(*(words[i:] for i in range(SHINGLE_SIZE))))), reverse=True)
+    filled = {h % NUM_BINS: h for h in hashes}
+    bins = [filled.get(i) for i in range(NUM_BINS)]
+
+    # Rotation densification
+    for i in range(NUM_BINS):
+        if bins[i] is None:
+            j = (i + 1) % NUM_BINS
+            while bins[j] is None:
+                j = (j + 1) % NUM_BINS
+            bins[i] = bins[j] + (j - i) % NUM_BINS
+    return tuple(bins)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / NUM_BINS
+
+
+def _title_overlap(words_a, words_b):
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def _richness(job):
+    """Prefer the record with the longest description, then the one with the most filled fields."""
+    filled = sum(1 for key in ("Location", "Published At", "Company") if job.get(key))
+    return len(job.get("Full Description", "") or ""), filled
+
+
+def collapse_near_duplicates(jobs, threshold=None):
+    """
+    Collapse the same posting syndicated through several sources into a single entry.
+
+    Two entries are duplicates when their normalized title + company + location fingerprints are
+    identical (and the company is known), or when MinHash/LSH finds their descriptions at least `threshold` similar and their
+    companies agree (or one is unknown) and titles overlap. Candidate pairs only come from shared
+    fingerprints or LSH buckets, so the work stays roughly linear in the number of postings.
+
+    Args:
+        jobs (List[Dict]): Job entries (e.g. the output of filter_and_dedupe).
+        threshold (float): Minimum estimated description similarity; defaults to config.NEAR_DUPLICATE_THRESHOLD.
+
+    Returns:
+        List[Dict]: One entry per cluster - the richest record - at the position of the cluster's
+        first entry.
+    """
+    threshold = config.NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+    parent = list(range(len(jobs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    fingerprints = [fingerprint(job) for job in jobs]
+    title_words = [frozenset(title.split()) for title, _, _ in fingerprints]
+    by_fingerprint = {}
+    buckets = {}
+    signatures = []
+    for i, job in enumerate(jobs):
+        # Without a company the title + location alone is too weak to call two postings the same
+        if fingerprints[i][1]:
+            first = by_fingerprint.setdefault(fingerprints[i], i)
+            if first != i:
+                union(first, i)
+
+        signature = minhash(job.get("Full Description", "") or "")
+        signatures.append(signature)
+        if signature is None:
+            continue
+        for band in range(BANDS):
+            key = (band, signature[band * ROWS:(band + 1) * ROWS])
+            members = buckets.setdefault(key, [])
+            company = fingerprints[i][1]
+            for j in members[:MAX_BUCKET_COMPARISONS]:
+                other_company = fingerprints[j][1]
+                if company and other_company and company != other_company:
+                    continue
+                if find(i) == find(j) or _title_overlap(title_words[i], title_words[j]) < 0.5:
+                    continue
+                if similarity(signature, signatures[j]) >= threshold:
+                    union(i, j)
+            members.append(i)
+
+    # Ties go to the smallest link, so the pick doesn't depend on input order
+    best = {}
+    for i, job in enumerate(jobs):
+        root = find(i)
+        richness, link = _richness(job), job.get("Link", "") or ""
+        if root in best:
+            best_richness, best_link, _ = best[root]
+            if richness < best_richness or (richness == best_richness and link >= best_link):
+                continue
+        best[root] = (richness, link, i)
+    return [jobs[best[root][2]] for root in sorted(best)]
@@ -0,0 +1,143 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+import rate_limiter
+
+_session = None
+_bounded_session = None
+_session_lock = threading.Lock()
+_hedge_pool = None
+
+
+def _build_retry(read_retries=config.HTTP_MAX_RETRIES):
+    """Build the retry policy shared by every pooled connection."""
+    options = dict(
+        total=config.HTTP_MAX_RETRIES,
+        connect=config.HTTP_MAX_RETRIES,
+        read=read_retries,
+        status=config.HTTP_MAX_RETRIES,
+        status_forcelist=config.HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        backoff_factor=config.HTTP_BACKOFF_FACTOR,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        # urllib3 >= 2 supports jitter natively
+        return Retry(backoff_jitter=config.HTTP_BACKOFF_JITTER, **options)
+    except TypeError:
+        return Retry(**options)
+
+
+def _build_session(read_retries=config.HTTP_MAX_RETRIES):
+    """Create a session with per-host keep-alive pools and bounded retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        max_retries=_build_retry(read_retries),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # requests already negotiates gzip/deflate, set it explicitly so it can't be dropped by accident
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _get_bounded_session():
+    """Session for requests with a deadline: their read timeout ends at the deadline, so it isn't retried."""
+    global _bounded_session
+    if _bounded_session is None:
+        with _session_lock:
+            if _bounded_session is None:
+                _bounded_session = _build_session(read_retries=0)
+    return _bounded_session
+
+
+def _retry_after(resp):
+    try:
+        return float(resp.headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _was_throttled(resp):
+    """True if the host answered 429, either finally or on a retried attempt."""
+    if resp.status_code == 429:
+        return True
+    retries = getattr(resp.raw, "retries", None)
+    return retries is not None and any(attempt.status == 429 for attempt in retries.history)
+
+
+def get(url, priority=0, deadline=None, **kwargs):
+    """
+    Send a GET request through the shared pooled session.
+
+    Every request is admitted by the per-host scheduler (see rate_limiter), which enforces the
+    host's rate and in-flight limits and lets lower `priority` values (e.g. first pages) go first.
+    Transient failures (connection errors, 429 and 5xx) are retried with exponential backoff and
+    jitter, honoring Retry-After. The final response is returned as-is so callers keep using
+    raise_for_status() to surface errors.
+
+    With a `deadline` (a time.monotonic() value), waiting for the scheduler stops there with a
+    TimeoutError and read timeouts are not retried; callers size `timeout` to the deadline.
+    """
+    limiter = rate_limiter.limiter_for(url)
+    limiter.acquire(priority, deadline)
+    start = time.perf_counter()
+    resp = None
+    try:
+        session = get_session() if deadline is None else _get_bounded_session()
+        resp = session.get(url, **kwargs)
+        return resp
+    finally:
+        if resp is None:
+            limiter.release(time.perf_counter() - start, failed=True)
+        else:
+            limiter.release(time.perf_counter() - start, throttled=_was_throttled(resp),
+                            retry_after=_retry_after(resp))
+
+
+def _get_hedge_pool():
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _session_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(max_workers=config.MAX_CONCURRENCY * 2, thread_name_prefix="hedge")
+    return _hedge_pool
+
+
+def hedged_get(url, hedge_after, **kwargs):
+    """
+    GET with a hedge for slow tail calls: if no response arrived after `hedge_after` seconds, a
+    duplicate request is sent and whichever finishes first is returned. Only for idempotent requests.
+    """
+    pool = _get_hedge_pool()
+    attempts = [pool.submit(get, url, **kwargs)]
+    done, _ = wait(attempts, timeout=hedge_after)
+    if not done:
+        attempts.append(pool.submit(get, url, **kwargs))
+        done, _ = wait(attempts, return_when=FIRST_COMPLETED)
+        # Prefer a successful response if the first one to finish failed
+        if all(future.exception() is not None for future in done):
+            done, _ = wait(attempts)
+    for future in attempts:
+        if future in done and future.exception() is None:
+            return future.result()
+    return next(iter(done)).result()
@@ -1,21 +1,181 @@
 # === Standard library ===
-import re
-from datetime import datetime, timezone
-from concurrent.futures import ThreadPoolExecutor
+import heapq
+import queue
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial, wraps
+from itertools import zip_longest
 import json
-import pandas as pd
-
-# === Third-party ===
-import requests
+import math
+import time
+import threading
 
 # === Local ===
 import config
+import http_client
+from matcher import compile_matcher
+from cache_utils import get_fragment_key, get_source_ttl, load_cache, save_cache
+from paginator import Page, paginate
+from run_stats import RunStats
+from search_index import SearchIndex, tokenize
+from job_record import JobRecord, MatchedJob, parse_timestamp
 
 country_map = config.country_map
 
+# Airtable share URL and auth headers scraped from the Goonzile embed page, reused until they stop working
+_GOONZILE_HANDSHAKE_KEY = "goonzile_handshake"
+_goonzile_state = {"handshake": None}
+_goonzile_lock = threading.Lock()
+
+def _round_robin(units):
+    """
+    Return the indexes of (source, unit) pairs interleaved across sources, so scheduling them in
+    that order can't let one source with many queries (e.g. Adzuna) starve the others.
+    """
+    by_source = {}
+    for index, (source, _) in enumerate(units):
+        by_source.setdefault(source, []).append(index)
+    return [index for batch in zip_longest(*by_source.values()) for index in batch if index is not None]
+
+
+@contextmanager
+def _request_cap(finders, max_concurrency):
+    """
+    Let at most `max_concurrency` upstream requests of `finders` be in flight at once. Slots are
+    taken per HTTP request, so pages prefetched by a paginated unit count against the same cap.
+    """
+    slots = threading.BoundedSemaphore(max_concurrency)
+    for finder in finders:
+        finder._request_slots = slots
+    try:
+        yield
+    finally:
+        for finder in finders:
+            finder._request_slots = None
+
+
+def _cached_fragment(source):
+    """
+    Cache a page method's parsed entries per (source, *args) when the finder has caching enabled.
+    Each page method issues exactly one upstream request, so this caches at request granularity.
+    The result count of a Page is cached along with its entries.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args):
+            if not self.use_cache or self.incremental:
+                jobs = method(self, *args)
+            else:
+                cache_key = get_fragment_key(source, *args)
+                cached = load_cache(cache_key, get_source_ttl(source))
+                self.stats.record_cache(source, cached is not None)
+                if isinstance(cached, dict):
+                    jobs = Page((JobRecord.from_dict(job, source) for job in cached["jobs"]), cached["total"])
+                elif cached is not None:
+                    jobs = [JobRecord.from_dict(job, source) for job in cached]
+                else:
+                    jobs = method(self, *args)
+                    entries = [job.to_dict() for job in jobs]
+                    if getattr(jobs, "total", None) is not None:
+                        save_cache(cache_key, {"total": jobs.total, "jobs": entries})
+                    else:
+                        save_cache(cache_key, entries)
+            self.stats.record_records(source, len(jobs))
+            return jobs
+        return wrapper
+    return decorator
+
+
+def _goonzile_handshake(get, refresh=False):
+    """
+    Return (share_url, headers) for the Goonzile Airtable view.
+
+    The embed page is only scraped when nothing is cached in memory or on disk, or when `refresh`
+    is set because the cached values were rejected.
+
+    Args:
+        get (Callable): Function used to send the GET request, e.g. a bound JobFinder._get.
+        refresh (bool): Ignore cached values and scrape again.
+    """
+    with _goonzile_lock:
+        if not refresh:
+            if _goonzile_state["handshake"] is None:
+                _goonzile_state["handshake"] = load_cache(_GOONZILE_HANDSHAKE_KEY, config.GOONZILE_HANDSHAKE_TTL_MINUTES)
+            if _goonzile_state["handshake"] is not None:
+                return _goonzile_state["handshake"]
+
+        headers = config.GOONZILE_BASE_HEADERS
+        url = config.GOONZILE_IFRAME_URL
+        step = get(url, headers=headers)
+        x = step.text
+
+        start = config.GOONZILE_IFRAME_URL_START
+        end = config.GOONZILE_IFRAME_URL_END
+        new_url = (config.GOONZILE_BASE_URL + x[x.find(start) +
+        len(start):x.rfind(end)].strip().replace('u002F','').replace('"','').replace(  '\\', '/')[:-1])
+
+        start = 'var headers = '
+        end = "headers['x-time-zone'] "
+        dirty_auth_json = x[x.find(start) + len(start):x.rfind(end)].strip()[:-1]
+        auth_json = json.loads(dirty_auth_json)
+
+        new_headers = config.GOONZILE_BASE_HEADERS.copy()
+        new_headers['X-Airtable-Application-Id'] = auth_json['x-airtable-application-id']
+        new_headers['X-Airtable-Page-Load-Id'] = auth_json['x-airtable-page-load-id']
+
+        _goonzile_state["handshake"] = [new_url, new_headers]
+        save_cache(_GOONZILE_HANDSHAKE_KEY, _goonzile_state["handshake"])
+        return _goonzile_state["handshake"]
+
+
+def _parse_goonzile_rows(table):
+    """
+    Yield job entries from an Airtable shared-view table, keeping only rows located in a known Israeli city.
+
+    Args:
+        table (Dict): The 'data.table' object of the Airtable response, with 'columns' and 'rows'.
+    """
+    id_to_city = config.ID_TO_CITY
+    names = {col['id']: col['name'] for col in table['columns']}
+
+    for row in table['rows']:
+        cells = {names.get(k, k): v for k, v in row.get('cellValuesByColumnId', {}).items()}
+
+        location_ids = cells.get('Location')
+        if not isinstance(location_ids, list):
+            continue
+        city = next((id_to_city[i] for i in location_ids if i in id_to_city), None)
+        if city is None:
+            continue
+
+        # Airtable may return a list of dicts like [{'text': 'line 1'}, {'text': 'line 2'}]
+        desc_raw = cells.get('Job Description', '')
+        if isinstance(desc_raw, list):
+            full_desc = " ".join(part.get('text', '') for part in desc_raw if isinstance(part, dict))
+        else:
+            full_desc = str(desc_raw)
+
+        title = cells.get('Job Title', '')
+        company = cells.get('Company', '')
+        if not full_desc.strip():
+            print(f"Empty description for: {title or 'Unknown'} @ {company or 'Unknown'}")
+
+        yield JobRecord(
+            description=f"{title} at {company}".strip(),
+            link=cells.get('Position Link', ''),
+            location=city,
+            published_at=row.get('createdTime', ''),
+            full_description=full_desc,
+            source="goonzile",
+            company=company if isinstance(company, str) else "",
+        )
+
 
 class JobFinder:
-    def __init__(self, keywords, secondary_keywords, locations, limit=300):
+    def __init__(self, keywords, secondary_keywords, locations, limit=300, use_cache=False, store=None,
+                 stats=None, incremental=False, prefilter=False, index=False, hedge_after=None):
         """
                Initialize a JobFinder instance.
 
@@ -24,6 +184,21 @@ class JobFinder:
                    secondary_keywords (List[str]): Secondary keywords to further refine matches.
                    locations (List[str]): List of location names or country aliases for job search.
                    limit (int): Maximum number of results to fetch per API call (default: 300).
+                   use_cache (bool): Reuse cached responses per (source, keyword, location, page) request.
+                   store (JobStore): Optional persistent store; fetched entries are upserted into it and
+                                     filtering runs as an indexed query against it.
+                   stats (RunStats): Collector for per-source request/cache/error stats; a new one is
+                                     created if omitted and exposed as `self.stats`.
+                   incremental (bool): With a store, refresh only the delta since the last run: paginated
+                                       queries stop at the first page with nothing newer than the stored
+                                       watermark. Responses bypass the fragment cache.
+                   prefilter (bool): Drop entries that can't match (location, then keywords) as they
+                                     arrive instead of keeping them in `_raw`. Ignored with a store,
+                                     which keeps every entry for later queries.
+                   index (bool): Build a BM25 search index (`self.index`) over the entries as they are
+                                 ingested, for rank_by_relevance().
+                   hedge_after (float): Send a duplicate of any request still unanswered after this many
+                                        seconds and use whichever response arrives first (off if None).
 
                Behavior:
                    - Converts all keywords and secondary_keywords to lowercase and strips whitespace.
@@ -35,6 +210,18 @@ class JobFinder:
         self.keywords = [k.lower().strip() for k in keywords]
         self.secondary_keywords = [k.lower().strip() for k in secondary_keywords]
         self.limit = limit
+        self.use_cache = use_cache
+        self.store = store
+        self.stats = stats if stats is not None else RunStats()
+        self.incremental = incremental and store is not None
+        self.prefilter = prefilter and store is None
+        self._location_matches = {}
+        self.index = SearchIndex() if index else None
+        self.hedge_after = hedge_after
+        # Only set on the per-run copy a latency-budget run works through (see _aggregate_within)
+        self._deadlines = {}  # source -> time.monotonic() deadline
+        self._stop = threading.Event()  # Set when the run abandons its units
+        self._request_slots = None  # Semaphore capping requests in flight (see _request_cap)
         self._raw = []
 
         normalized_contries = [loc.lower().strip() for loc in locations]
@@ -52,316 +239,739 @@ class JobFinder:
         return self._raw
 
     def set_raw(self, data):
-        """Set the internal raw job data (used when loading from cache)."""
+        """Replace the internal raw job data, e.g. with entries fetched elsewhere, before filtering."""
         self._raw = data
 
-    def aggregate(self):
-        """Fetch and aggregate raw job data from various sources concurrently based on the specified locations."""
+    def aggregate(self, mode="threads", max_concurrency=config.MAX_CONCURRENCY, budget=None, source_deadlines=None):
+        """
+        Fetch and aggregate raw job data from various sources concurrently based on the specified locations.
+
+        Whether each source came back complete, partial or missing is recorded in the run stats.
+
+        Args:
+            mode (str): "threads" runs one thread per source, each walking its own requests in order.
+                        "async" schedules every request unit as its own task: one per single-request
+                        fragment, one per paginated query (Adzuna keyword-location, the Arbeitnow
+                        board) whose pages are prefetched concurrently.
+            max_concurrency (int): Maximum number of requests in flight at once, pages included
+                                   (async and budget modes).
+            budget (float): Overall latency budget in seconds. Every request unit is scheduled on its
+                            own (whatever the mode) and whatever has arrived when the budget runs out
+                            is kept; the rest is abandoned.
+            source_deadlines (Dict[str, float]): Per-source deadlines in seconds within the budget
+                                                 (default: config.SOURCE_DEADLINE_SECONDS).
+        """
+        if budget is not None:
+            self._aggregate_within(budget, max_concurrency, source_deadlines)
+        elif mode == "async":
+            asyncio.run(self.aggregate_async(max_concurrency))
+        else:
+            self._raw.clear()
+            fetchers = {
+                "goonzile": self._fetch_goonzile,
+                "adzuna": self._fetch_adzuna,
+                "remotive": self._fetch_remotive,
+                "remoteok": self._fetch_remoteok,
+                "arbeitnow": self._fetch_arbeitnow,
+            }
+            # Execute all fetch functions in parallel threads (one per source) and surface any source that failed
+            sources = self._selected_sources()
+            succeeded, failed = {}, {}
+            errors_before = self._error_counts()
+            with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+                futures = {source: executor.submit(fetchers[source]) for source in sources}
+                for source, future in futures.items():
+                    try:
+                        future.result()
+                        succeeded[source] = 1
+                    except Exception as e:
+                        print(f"\u274c {source} failed: {e}")
+                        self.stats.record_error(source, e)
+                        failed[source] = 1
+            self._record_source_statuses(succeeded, failed, errors_before)
+
+        if self.store is not None:
+            self.store.upsert(self._raw)
+
+    async def aggregate_async(self, max_concurrency=config.MAX_CONCURRENCY):
+        """
+        Fetch raw job data with every request unit (see _request_units) scheduled independently.
+
+        Requests still use the blocking HTTP client, so each unit runs on a worker thread while a
+        semaphore caps how many run at once, and a shared request cap keeps the pages prefetched
+        by paginated units within `max_concurrency` too. Wall-clock time is bounded by the slowest
+        unit rather than by the longest chain of requests within one source.
+
+        Args:
+            max_concurrency (int): Global cap on concurrent requests across all sources.
+        """
+        self._raw.clear()
+        errors_before = self._error_counts()
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor, _request_cap([self], max_concurrency):
+            async def run(source, unit):
+                async with semaphore:
+                    try:
+                        return await loop.run_in_executor(executor, unit)
+                    except Exception as e:
+                        print(f"\u274c {source} request failed: {e}")
+                        self.stats.record_error(source, e)
+                        return None
+
+            units = list(self._request_units())
+            # Tasks take the semaphore in creation order, so interleave sources to start them all early
+            order = _round_robin(units)
+            gathered = await asyncio.gather(*(run(*units[index]) for index in order))
+            results = [None] * len(units)
+            for index, records in zip(order, gathered):
+                results[index] = records
+
+        # Extend in scheduling order so the raw list is deterministic regardless of completion order
+        succeeded, failed = {}, {}
+        for (source, _), records in zip(units, results):
+            if records is None:
+                failed[source] = failed.get(source, 0) + 1
+            else:
+                succeeded[source] = succeeded.get(source, 0) + 1
+                self._raw.extend(self._ingest(records))
+        self._record_source_statuses(succeeded, failed, errors_before)
+
+    def _aggregate_within(self, budget, max_concurrency, source_deadlines=None):
+        """
+        Run every request unit independently and keep whatever has arrived when the budget runs out.
+
+        Each source gets a deadline of min(budget, its own deadline); requests are sent with timeouts
+        that end at the deadline and fail immediately once it has passed, so paginated queries return
+        the pages they have and abandoned units wind down on their own instead of blocking the caller.
+
+        The deadlines, stop event and request cap live on a shallow copy of the finder that the
+        units are bound to, so they only apply to this run - abandoned units keep honoring them
+        while the finder itself can be used again right away.
+        """
         self._raw.clear()
+        errors_before = self._error_counts()
+        start = time.monotonic()
+        deadlines = config.SOURCE_DEADLINE_SECONDS if source_deadlines is None else source_deadlines
+        # Deadlines end slightly before the budget so paginated queries can hand back the pages they got
+        cutoff = max(budget - config.BUDGET_COLLECT_SECONDS, 0)
+        run = copy.copy(self)
+        run._deadlines = {source: start + min(cutoff, deadlines.get(source, cutoff))
+                          for source in self._selected_sources()}
+        run._stop = threading.Event()
+        run._request_slots = threading.BoundedSemaphore(max_concurrency)
+
+        units = list(run._request_units())
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            submitted = {index: executor.submit(units[index][1]) for index in _round_robin(units)}
+            futures = [(source, submitted[index]) for index, (source, _) in enumerate(units)]
+            done, _ = wait(submitted.values(), timeout=budget)
+        finally:
+            # Don't wait for stragglers; paginated units stop queueing pages too
+            run._stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        succeeded, failed = {}, {}
+        for source, future in futures:
+            if future in done and future.exception() is None:
+                succeeded[source] = succeeded.get(source, 0) + 1
+                self._raw.extend(self._ingest(future.result()))
+                continue
+            error = future.exception() if future in done else TimeoutError("latency budget exhausted")
+            print(f"\u274c {source} request dropped: {error}")
+            self.stats.record_error(source, error)
+            failed[source] = failed.get(source, 0) + 1
+        self._record_source_statuses(succeeded, failed, errors_before)
+
+    def _error_counts(self):
+        """Errors recorded so far per source, so a fetch can tell which ones it caused itself."""
+        return {source: source_stats.errors for source, source_stats in list(self.stats.sources.items())}
+
+    def _record_source_statuses(self, succeeded, failed, errors_before, sources=None):
+        """
+        Flag every selected source in the run stats as "complete", "partial" (some requests or pages
+        failed or were dropped during this fetch) or "missing" (nothing arrived), so a failed source
+        is never mistaken for one that had no jobs.
+        """
+        for source in sources or self._selected_sources():
+            source_stats = self.stats.sources.get(source)
+            if not succeeded.get(source):
+                status = "missing"
+            elif failed.get(source) or (source_stats is not None
+                                        and source_stats.errors > errors_before.get(source, 0)):
+                status = "partial"
+            else:
+                status = "complete"
+            self.stats.set_source_status(source, status)
+
+    def iter_raw(self, max_concurrency=config.MAX_CONCURRENCY):
+        """
+        Yield raw job entries as soon as each upstream request completes.
+
+        Unlike aggregate(), entries are not collected into `_raw`; only pages that are in flight or
+        not yet consumed are held in memory. Entries are still upserted into the store if attached.
+        Source statuses are recorded once the stream ends; units not consumed by then count as failed.
+
+        Args:
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Yields:
+            Dict: Raw job entries, in completion order.
+        """
+        done = queue.Queue()
+        submitted, succeeded = {}, {}
+        errors_before = self._error_counts()
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor, _request_cap([self], max_concurrency):
+                pending = 0
+                units = list(self._request_units())
+                for source, unit in (units[index] for index in _round_robin(units)):
+                    future = executor.submit(unit)
+                    future.add_done_callback(lambda f, source=source: done.put((source, f)))
+                    submitted[source] = submitted.get(source, 0) + 1
+                    pending += 1
+
+                while pending:
+                    source, future = done.get()
+                    pending -= 1
+                    try:
+                        jobs = future.result()
+                    except Exception as e:
+                        print(f"\u274c {source} request failed: {e}")
+                        self.stats.record_error(source, e)
+                        continue
+                    succeeded[source] = succeeded.get(source, 0) + 1
+                    if self.store is not None:
+                        self.store.upsert(jobs)
+                    yield from self._ingest(jobs)
+        finally:
+            self._record_source_statuses(succeeded, {source: count - succeeded.get(source, 0)
+                                                     for source, count in submitted.items()}, errors_before)
+
+    @staticmethod
+    def aggregate_shared(finders, max_concurrency=config.MAX_CONCURRENCY):
+        """
+        Fetch raw job data for several finders at once, sending each distinct upstream request only once.
+
+        The request units of all finders are keyed by (source, *request arguments) - the same
+        fragments the response cache uses - and the union is run on one pool. Every finder then gets
+        the entries of its own fragments as its raw list; entries are shared, not copied. Source
+        statuses are recorded per RunStats, over the fragments of every finder reporting to it.
+
+        Args:
+            finders (List[JobFinder]): Finders to fill, e.g. one per user profile.
+            max_concurrency (int): Maximum number of requests in flight at once.
+
+        Returns:
+            int: Number of distinct upstream requests that were run.
+        """
+        units = {}
+        plans = []
+        for finder in finders:
+            keys = []
+            for source, unit in finder._request_units():
+                key = (source, *getattr(unit, "args", ()))
+                units.setdefault(key, (source, unit, finder))
+                keys.append(key)
+            plans.append(keys)
+
+        results = {}
+        failed_keys = set()
+        errors_before = {id(finder.stats): finder._error_counts() for finder in finders}
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor, _request_cap(finders, max_concurrency):
+            keys = list(units)
+            order = _round_robin([(units[key][0], None) for key in keys])
+            futures = {keys[index]: executor.submit(units[keys[index]][1]) for index in order}
+            for key, future in futures.items():
+                source, _, owner = units[key]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    print(f"\u274c {source} request failed: {e}")
+                    owner.stats.record_error(source, e)
+                    results[key] = []
+                    failed_keys.add(key)
+
+        for finder, keys in zip(finders, plans):
+            records = [job for key in dict.fromkeys(keys) for job in results[key]]
+            if finder.store is not None:
+                finder.store.upsert(records)
+            finder._raw = finder._ingest(records)
+
+        # Finders usually share one RunStats (a batch), so statuses cover all their fragments together
+        groups = {}
+        for finder, keys in zip(finders, plans):
+            _, group_keys, sources = groups.setdefault(id(finder.stats), (finder, set(), set()))
+            group_keys.update(keys)
+            sources.update(finder._selected_sources())
+        for finder, group_keys, sources in groups.values():
+            succeeded, failed = {}, {}
+            for key in group_keys:
+                outcome = failed if key in failed_keys else succeeded
+                outcome[key[0]] = outcome.get(key[0], 0) + 1
+            finder._record_source_statuses(succeeded, failed, errors_before[id(finder.stats)], sources)
+        return len(units)
+
+    def _ingest(self, records):
+        """Prefilter freshly fetched entries and add the survivors to the search index, if any."""
+        records = self._prefilter(records)
+        if self.index is not None:
+            self.index.add_all(records)
+        return records
+
+    def _prefilter(self, records):
+        """
+        Keep only the entries that can still match this finder's query (when prefiltering is on).
+
+        Applies the exact location predicate first - memoized per distinct location string, which
+        is cheap since locations are interned and repetitive - then the keyword matcher, so
+        filter_and_dedupe later sees only real candidates and the rest is never held in `_raw`.
+        Dropped entries are counted per source in the run stats.
+
+        There is no per-source filter pushdown, so this saves memory and filter CPU but not bytes
+        transferred. The only request filters the sources accept are the Remotive and Adzuna
+        search terms, which were already sent and are matched loosely upstream; RemoteOK, Arbeitnow
+        and the Airtable view take none, and narrower ones such as Adzuna's `title_only` match
+        whole words rather than substrings, so pushing them would change the results.
+        """
+        if not self.prefilter:
+            return records
+        self._resolve_secondary_keywords()
+        matcher = compile_matcher(tuple(self.keywords + self.secondary_keywords))
+        keywords, secondary = set(self.keywords), set(self.secondary_keywords)
+        location_matches = self._location_matches
+
+        kept = []
+        dropped = {}
+        for job in records:
+            location = job.get("Location", "") or ""
+            matches = location_matches.get(location)
+            if matches is None:
+                lowered = location.lower()
+                matches = location_matches[location] = any(l in lowered for l in self.locations)
+            if matches:
+                found = matcher.find(job.get("Description", ""))
+                if found & keywords and found & secondary:
+                    kept.append(job)
+                    continue
+            source = getattr(job, "source", "")
+            dropped[source] = dropped.get(source, 0) + 1
+        for source, count in dropped.items():
+            self.stats.record_prefiltered(source, count)
+        return kept
+
+    def _selected_sources(self):
+        """Return the names of the sources relevant to the configured locations."""
         israel_locs = [loc for loc in self.locations if loc in config.normalized_cites_map]
         other_locs = [loc for loc in self.locations if loc not in config.normalized_cites_map]
 
-        tasks = []
-
+        sources = []
         if israel_locs:
-            tasks.append(self._fetch_goonzile())
-
+            sources.append("goonzile")
         if other_locs:
-            tasks.append(self._fetch_adzuna())
-            tasks.append(self._fetch_remotive())
-            tasks.append(self._fetch_remoteok())
-
+            sources.extend(["adzuna", "remotive", "remoteok"])
         if 'germany' in other_locs:
-            tasks.append(self._fetch_arbeitnow())
+            sources.append("arbeitnow")
+        return sources
 
-        # Execute all fetch functions in parallel threads
-        with ThreadPoolExecutor() as executor:
-            executor.map(lambda f: f(), tasks)
+    def _adzuna_queries(self):
+        """Yield (keyword, location, country_code) combinations queried on Adzuna."""
+        for kw in self.keywords:
+            for loc in self.locations:
+                if loc in country_map:
+                    yield kw, loc, country_map[loc]
 
-    def filter_and_dedupe(self):
+    def _caught_up(self, source, query):
+        """
+        Return a paginate() `until` predicate that ends a query once a page has nothing new, or None
+        when the whole result set must be walked (not incremental, no watermark yet, or a periodic
+        full refresh is due so unchanged entries get their last_seen bumped before they expire).
+        """
+        if not self.incremental:
+            return None
+        mark = self.store.watermark(source, query)
+        # A query whose last walk found nothing has no newest timestamp to stop at
+        if (mark is None or mark["newest_ts"] is None
+                or time.time() - mark["full_refresh_at"] > config.STORE_FULL_REFRESH_HOURS * 3600):
+            return None
+        newest_ts = mark["newest_ts"]
+
+        def until(page, results):
+            known = self.store.known_links([job.link for job in results])
+            return all(job.link in known or job.published_ts < newest_ts for job in results)
+        return until
+
+    def _advance_watermark(self, source, query, records, full):
+        """
+        Record the newest posting seen for a query (incremental mode only).
+
+        A paginated walk that lost or skipped pages (`records.complete` is False) doesn't advance
+        the watermark; instead the query is flagged so the next refresh walks it in full, since it
+        would otherwise stop at the first page it has seen and never fetch the missing ones.
+        """
+        deadline = self._deadlines.get(source)
+        if deadline is not None and time.monotonic() > deadline:
+            # Results arriving past the deadline are dropped, so the next refresh must fetch them again
+            return
+        if not self.incremental:
+            return
+        if not getattr(records, "complete", True):
+            self.store.require_full_refresh(source, query)
+            return
+        newest_ts = max((job.published_ts for job in records), default=None)
+        self.store.advance_watermark(source, query, newest_ts, full)
+
+    def _max_pages(self, page_size):
+        """Number of pages needed to reach `self.limit` results per query."""
+        return max(1, math.ceil(self.limit / page_size))
+
+    def _request_units(self):
+        """
+        Yield (source, unit) pairs where each unit is a zero-argument callable returning parsed job
+        entries. Each unit is one upstream request, or one paginated query whose pages are
+        prefetched concurrently (Adzuna, Arbeitnow).
+        """
+        for source in self._selected_sources():
+            if source == "goonzile":
+                yield source, self._goonzile_page
+            elif source == "adzuna":
+                for kw, loc, country_code in self._adzuna_queries():
+                    yield source, partial(self._adzuna_pages, kw, loc, country_code)
+            elif source == "remotive":
+                for kw in self.keywords:
+                    yield source, partial(self._remotive_page, kw, self.limit)
+            elif source == "remoteok":
+                yield source, self._remoteok_page
+            elif source == "arbeitnow":
+                yield source, self._arbeitnow_pages
+
+    def filter_and_dedupe(self, sort_by=None, preferences=None):
         """
         Filters raw job entries based on primary and secondary keywords and locations.
         Supports multi-word phrases with an optional word in between (e.g., 'cloud engineer' matches
         'cloud devops engineer', but not 'cloud, engineer').
 
+        All primary and secondary phrases are compiled once into a single matcher, so each
+        description is normalized and scanned only once. When a store is attached, candidates come
+        from an indexed query against it instead of the in-memory raw list.
+
+        Args:
+            sort_by (str): Store only - ordering to apply in SQL (see JobStore.SQL_SORTS).
+            preferences (List[str]): Store only - preference order used with sort_by="location".
+
         Returns:
             List[Dict]: A list of filtered and deduplicated job entries.
         """
-        @staticmethod
-        def phrase_with_optional_middle(phrase, text):
-            """
-            Check if the words in 'phrase' appear in order in 'text' with at most one word in between,
-            and with no punctuation like comma or dot between.
-
-            Parameters:
-                phrase (str): Phrase to search (e.g., "cloud engineer")
-                text (str): The text to search in
-
-            Returns:
-                bool: True if found as described, else False.
-            """
-            phrase = phrase.lower().strip()
-            text = text.lower()
-            text = re.sub(r'\s+', ' ', text)
-
-            words = phrase.split()
-            if len(words) != 2:
-                return phrase in text  # fallback for single-word phrases
-
-            word1, word2 = words
-            pattern = r'\b' + re.escape(word1) + r'(?:\s+\w+)?\s+' + re.escape(word2) + r'\b'
-
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                between = match.group(0)
-                if not re.search(r'[.,;:/\-]', between):
-                    return True
-            return False
-
-        # If no secondary keywords provided, reuse primary keywords
-        if not self.secondary_keywords or self.secondary_keywords == ['none']:
-            self.secondary_keywords = self.keywords
+        self._resolve_secondary_keywords()
+        if self.store is not None:
+            jobs = self.store.candidates(self.keywords, self.secondary_keywords, self.locations,
+                                         sort_by, preferences)
+        else:
+            jobs = self._raw
+        return list(self.iter_matches(jobs))
+
+    def iter_matches(self, jobs):
+        """
+        Incrementally filter and deduplicate a stream of raw job entries.
+
+        Applies the same rules as filter_and_dedupe, keeping a rolling set of seen links so each
+        match is yielded as soon as its entry arrives.
+
+        Args:
+            jobs (Iterable[Dict]): Raw job entries, e.g. from iter_raw().
+
+        Yields:
+            Dict: Filtered and deduplicated job entries.
+        """
+        self._resolve_secondary_keywords()
+        matcher = compile_matcher(tuple(self.keywords + self.secondary_keywords))
 
         seen = set()
-        results = []
-        for job in self._raw:
-            desc = job.get("Description", "").lower()
+        for job in jobs:
+            found = matcher.find(job.get("Description", ""))
+            if not found:
+                continue
             loc = job.get("Location", "").lower()
 
-            matched_keys = [
-                k for k in self.keywords if phrase_with_optional_middle(k, desc)
-            ]
-            matched_secondary = [
-                k for k in self.secondary_keywords if phrase_with_optional_middle(k, desc)
-            ]
+            matched_keys = [k for k in self.keywords if k in found]
+            matched_secondary = [k for k in self.secondary_keywords if k in found]
             matched_locs = [l for l in self.locations if l in loc]
 
             if matched_keys and matched_secondary and matched_locs:
                 url = job.get("Link")
                 if url and url not in seen:
                     seen.add(url)
-                    results.append({
-                        "Keyword": ", ".join(matched_keys),
-                        "Secondary Keyword": ", ".join(matched_secondary),
-                        "Description": job.get("Description", ""),
-                        "Link": url,
-                        "Location": job.get("Location", ""),
-                        "Published At": job.get("Published At", ""),
-                        "Full Description": job.get("Full Description", "")
-                    })
-
-        return results
+                    yield MatchedJob(job, ", ".join(matched_keys), ", ".join(matched_secondary))
+
+    def rank_by_relevance(self, jobs, top_n=None):
+        """
+        Order job entries by BM25 relevance of their title and full description to the roles and
+        levels, using the index built at ingestion. Entries missing from it (e.g. served from a
+        store) are indexed first.
+
+        Args:
+            jobs (List[Dict]): Filtered job entries.
+            top_n (int): Only return the N most relevant entries.
+
+        Returns:
+            List[Dict]: Entries, most relevant first.
+        """
+        self._resolve_secondary_keywords()
+        if self.index is None:
+            self.index = SearchIndex()
+        self.index.add_all(jobs)
+
+        by_link = {job.get("Link"): job for job in jobs}
+        terms = tokenize(" ".join(self.keywords + self.secondary_keywords))
+        ranked = [by_link[link] for link, _ in self.index.top_k(terms, top_n, by_link)]
+        if top_n is None or len(ranked) < top_n:
+            # Entries without any query term keep their order at the end
+            scored = {id(job) for job in ranked}
+            ranked.extend(job for job in jobs if id(job) not in scored)
+        return ranked if top_n is None else ranked[:top_n]
+
+    def _resolve_secondary_keywords(self):
+        """If no secondary keywords provided, reuse primary keywords."""
+        if not self.secondary_keywords or self.secondary_keywords == ['none']:
+            self.secondary_keywords = self.keywords
 
     @staticmethod
-    def sort_by_preference(jobs, sort_by, preferences):
+    def sort_by_preference(jobs, sort_by, preferences, top_n=None):
         """
         Sorts job entries based on user-preferred field or by date.
 
+        Dates come from the timestamp normalized once at ingestion, and preference ranks are
+        computed once per distinct field value (locations are interned and highly repetitive).
+        When only the first `top_n` entries are needed, a bounded heap is used instead of a full sort.
+
         Args:
             jobs (List[Dict]): List of job entries.
             sort_by (str): The field to sort by ('location', 'keyword', or 'published at').
             preferences (List[str]): List of preferred values to prioritize (used only for location/keyword).
+            top_n (int): Optional number of leading entries to return.
 
         Returns:
             List[Dict]: Sorted list of job entries.
         """
 
         if sort_by.lower() == "published at":
-            def parse_date(date_str):
-                try:
-                    # Replace 'Z' with +00:00 to make it ISO format with timezone
-                    date_str = date_str.replace("Z", "+00:00")
-                    dt = datetime.fromisoformat(date_str)
-                    # Ensure all dates are timezone-aware
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    return dt
-                except:
-                    return datetime.min.replace(tzinfo=timezone.utc)
-
-            return sorted(jobs, key=lambda job: parse_date(job.get("Published At", "")), reverse=True)
+            def published_ts(job):
+                ts = getattr(job, "published_ts", None)
+                return ts if ts is not None else parse_timestamp(job.get("Published At", ""))
+
+            if top_n is not None:
+                return heapq.nlargest(top_n, jobs, key=published_ts)
+            return sorted(jobs, key=published_ts, reverse=True)
 
         else:
-            def get_sort_index(job):
-                field = job.get(sort_by.capitalize(), "").lower()
-                for i, pref in enumerate(preferences):
-                    if pref.lower() in field:
-                        return i
-                return len(preferences)
+            field_name = sort_by.capitalize()
+            lowered = [pref.lower() for pref in preferences]
+            ranks = {}
 
+            def get_sort_index(job):
+                field = job.get(field_name, "")
+                rank = ranks.get(field)
+                if rank is None:
+                    value = field.lower()
+                    rank = ranks[field] = next((i for i, pref in enumerate(lowered) if pref in value), len(lowered))
+                return rank
+
+            if top_n is not None:
+                return heapq.nsmallest(top_n, jobs, key=get_sort_index)
             return sorted(jobs, key=get_sort_index)
 
     # =============  PRIVATE HELPERS - FETCHERS =============
 
+    def _get(self, source, url, **kwargs):
+        """
+        Send a GET through the shared HTTP client and record latency, bytes and retries for `source`.
+
+        Every request has a connect and read timeout; during a latency-budget run they are capped by
+        the source's deadline, and requests past it fail immediately. With `hedge_after` set, slow
+        requests are hedged with a duplicate.
+        """
+        connect = config.HTTP_CONNECT_TIMEOUT
+        read = config.SOURCE_READ_TIMEOUTS.get(source, config.HTTP_READ_TIMEOUT)
+        deadline = self._deadlines.get(source)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{source} deadline exceeded")
+            connect, read = min(connect, remaining), min(read, remaining)
+            kwargs["deadline"] = deadline
+        kwargs.setdefault("timeout", (connect, read))
+
+        slots = self._request_slots
+        if slots is not None and not slots.acquire(timeout=None if deadline is None
+                                                   else max(deadline - time.monotonic(), 0)):
+            raise TimeoutError(f"{source} deadline exceeded")
+        try:
+            start = time.perf_counter()
+            if self.hedge_after is not None:
+                resp = http_client.hedged_get(url, self.hedge_after, **kwargs)
+            else:
+                resp = http_client.get(url, **kwargs)
+        finally:
+            if slots is not None:
+                slots.release()
+        retries = getattr(resp.raw, "retries", None)
+        self.stats.record_request(source, time.perf_counter() - start, len(resp.content),
+                                  len(retries.history) if retries is not None else 0)
+        return resp
+
     def _fetch_remotive(self):
         """
          Fetch remote job listings from the Remotive API for each primary keyword.
         """
-        url = "https://remotive.com/api/remote-jobs"
         for kw in self.keywords:
-            resp = requests.get(url, params={"search": kw, "limit": self.limit})
-            resp.raise_for_status()
-            for job in resp.json().get("jobs", []):
-                self._raw.append({
-                    "Description": job.get("title", ""),
-                    "Link": job.get("url", ""),
-                    "Location": job.get("candidate_required_location", ""),
-                    "Published At": job.get("date", ""),
-                    "Full Description": job.get("description", "")
-                })
+            self._raw.extend(self._ingest(self._remotive_page(kw, self.limit)))
+
+    @_cached_fragment("remotive")
+    def _remotive_page(self, kw, limit):
+        """Fetch a single Remotive search for one keyword."""
+        resp = self._get("remotive", config.REMOTIVE_API_URL, params={"search": kw, "limit": limit})
+        resp.raise_for_status()
+        records = [JobRecord(
+            description=job.get("title", ""),
+            link=job.get("url", ""),
+            location=job.get("candidate_required_location", ""),
+            published_at=job.get("date", ""),
+            full_description=job.get("description", ""),
+            source="remotive",
+            company=job.get("company_name", ""),
+        ) for job in resp.json().get("jobs", [])]
+        self._advance_watermark("remotive", kw, records, full=True)
+        return records
 
     def _fetch_goonzile(self):
         """
          Fetch job listings from the Goonzile (Airtable) source, specifically for Israeli locations.
         """
-        s = requests.Session()
-        headers = config.GOONZILE_BASE_HEADERS
-        url = config.GOONZILE_IFRAME_URL
-        step = s.get(url, headers=headers)
-        x = step.text
-
-        start = config.GOONZILE_IFRAME_URL_START
-        end = config.GOONZILE_IFRAME_URL_END
-        new_url = ('https://airtable.com' + x[x.find(start) +
-        len(start):x.rfind(end)].strip().replace('u002F','').replace('"','').replace(  '\\', '/')[:-1])
-
-        start = 'var headers = '
-        end = "headers['x-time-zone'] "
-        dirty_auth_json = x[x.find(start) + len(start):x.rfind(end)].strip()[:-1]
-        auth_json = json.loads(dirty_auth_json)
-
-        new_headers = config.GOONZILE_BASE_HEADERS.copy()
-        new_headers['X-Airtable-Application-Id'] = auth_json['x-airtable-application-id']
-        new_headers['X-Airtable-Page-Load-Id'] = auth_json['x-airtable-page-load-id']
-
-        json_data = s.get(new_url, headers=new_headers).json()
-        cols = {x['id']: x['name'] for x in json_data['data']['table']['columns']}
-        rows = json_data['data']['table']['rows']
-        df = pd.json_normalize(rows)
-        df.columns = [next((x.replace('cellValuesByColumnId.', '').replace(k, v) for k, v in cols.items() if k in x), x)
-                      for x in df.columns]
-
-        id_to_city = {}
-        for city, ids in config.normalized_cites_map.items():
-            for id in ids:
-                id_to_city[id] = city
-
-        if "Location" in df.columns:
-            df = df[df["Location"].apply(lambda x: any(i in set(id_to_city.keys()) for i in x) if isinstance(x, list) else False)]
-
-        desired_cols = ['Job Title', 'Position Link', 'Company', 'Location', 'createdTime', 'Job Description']
-        existing_cols = [col for col in desired_cols if col in df.columns]
-        output_df = df[existing_cols]
-
-        if 'Location' in output_df.columns:
-            output_df.loc[:, 'Location'] = output_df['Location'].apply(
-                lambda ids: next((id_to_city[i] for i in ids if i in id_to_city), "Israel") if isinstance(ids,
-                                                                                                list) else "Israel")
-
-        for _, row in output_df.iterrows():
-            # Safely extract the job description
-            desc_raw = row.get('Job Description', '')
-            if isinstance(desc_raw, list):
-                # Airtable may return a list of dicts like [{'text': 'line 1'}, {'text': 'line 2'}]
-                full_desc = " ".join(part.get('text', '') for part in desc_raw if isinstance(part, dict))
-            else:
-                full_desc = str(desc_raw)
-
-            if not full_desc.strip():
-                print(f"Empty description for: {row.get('Job Title', 'Unknown')} @ {row.get('Company', 'Unknown')}")
-
-            # Append the job
-            self._raw.append({
-                "Description": f"{row['Job Title']} at {row.get('Company', '')}".strip(),
-                "Link": row['Position Link'],
-                "Location": row['Location'],
-                "Published At": row['createdTime'],
-                "Full Description": full_desc
-            })
+        self._raw.extend(self._ingest(self._goonzile_page()))
+
+    @_cached_fragment("goonzile")
+    def _goonzile_page(self):
+        """Fetch the full Goonzile table, reusing the cached Airtable handshake while it still works."""
+        get = partial(self._get, "goonzile")
+        for attempt in range(2):
+            new_url, new_headers = _goonzile_handshake(get, refresh=attempt > 0)
+            try:
+                resp = get(new_url, headers=new_headers)
+                resp.raise_for_status()
+                table = resp.json()['data']['table']
+                break
+            except Exception:
+                # A stale share URL or page-load id fails here; scrape a fresh handshake once
+                if attempt:
+                    raise
+        records = list(_parse_goonzile_rows(table))
+        self._advance_watermark("goonzile", "", records, full=True)
+        return records
 
     def _fetch_adzuna(self):
         """
          Fetch job listings from the Adzuna API for each keyword-location combination.
         """
-        for kw in self.keywords:
-            for loc in self.locations:
-                country_code = None
-                if loc in country_map:
-                    country_code = country_map[loc]
-                else:
-                    continue
-                for page in range(1, 10):
-                    base_url = config.ADZUNA_API_URL_TEMPLATE.format(country=country_code, page=page)
-                    params = {
-                        "app_id": config.ADZUNA_APP_ID,
-                        "app_key": config.ADZUNA_APP_KEY,
-                        "what": kw,
-                        "where":  loc,
-                        "results_per_page": 50,
-                    }
-                    try:
-                        resp = requests.get(base_url, params=params)
-                        resp.raise_for_status()
-                        results = resp.json().get("results", [])
-                        if not results:
-                            break
-                        for job in results:
-                            self._raw.append({
-                                "Description": job.get("title", ""),
-                                "Link": job.get("redirect_url", ""),
-                                "Location": job.get("location", {}).get("display_name", ""),
-                                "Published At": job.get("created", ""),
-                                "Full Description": job.get("description", "")
-                            })
-                    except Exception as e:
-                        print(f"\u274c Adzuna failed: {e}")
-                        break
+        for kw, loc, country_code in self._adzuna_queries():
+            self._raw.extend(self._ingest(self._adzuna_pages(kw, loc, country_code)))
+
+    def _adzuna_pages(self, kw, loc, country_code):
+        """Fetch every page needed for one keyword-location query, sized by Adzuna's result count."""
+        def lost(page, e):
+            # Throttling is already retried by the scheduler; skip the lost page, not the rest
+            print(f"\u274c Adzuna page {page} for '{kw}' in {loc} lost: {e}")
+            self.stats.record_error("adzuna", e)
+
+        query = json.dumps([kw, loc, country_code])
+        until = self._caught_up("adzuna", query)
+        records = paginate(partial(self._adzuna_page, kw, loc, country_code),
+                           self._max_pages(config.ADZUNA_PAGE_SIZE), config.ADZUNA_PAGE_SIZE, on_error=lost,
+                           until=until, stop=self._stop)
+        self._advance_watermark("adzuna", query, records, full=until is None)
+        return records
+
+    @_cached_fragment("adzuna")
+    def _adzuna_page(self, kw, loc, country_code, page):
+        """Fetch one Adzuna results page for a keyword-location combination."""
+        base_url = config.ADZUNA_API_URL_TEMPLATE.format(country=country_code, page=page)
+        params = {
+            "app_id": config.ADZUNA_APP_ID,
+            "app_key": config.ADZUNA_APP_KEY,
+            "what": kw,
+            "where":  loc,
+            "results_per_page": config.ADZUNA_PAGE_SIZE,
+        }
+        if self.incremental:
+            # Newest first, so a refresh can stop at the first page it has already seen
+            params["sort_by"] = "date"
+        resp = self._get("adzuna", base_url, params=params, priority=page)
+        resp.raise_for_status()
+        data = resp.json()
+        return Page((JobRecord(
+            description=job.get("title", ""),
+            link=job.get("redirect_url", ""),
+            location=job.get("location", {}).get("display_name", ""),
+            published_at=job.get("created", ""),
+            full_description=job.get("description", ""),
+            source="adzuna",
+            company=job.get("company", {}).get("display_name", ""),
+        ) for job in data.get("results", [])), data.get("count"))
 
     def _fetch_arbeitnow(self):
         """
         Fetch job listings from the Arbeitnow API.
         """
-        for page in range(1, 10):
-            url = "https://www.arbeitnow.com/api/job-board-api"
-            try:
-                resp = requests.get(url, params={"page": page})
-                resp.raise_for_status()
-                jobs = resp.json().get("data", [])
-                if not jobs:
-                    break
-                for job in jobs:
-                    self._raw.append({
-                        "Description": job.get("title", ""),
-                        "Link": job.get("url", ""),
-                        "Location": job.get("location", ""),
-                        "Published At": job.get("published_at", "")  # Assuming the field is named 'published_at'
-                    })
-            except Exception as e:
-                print(f"Arbeitnow page {page} failed: {e}")
-                break
+        self._raw.extend(self._ingest(self._arbeitnow_pages()))
+
+    def _arbeitnow_pages(self):
+        """Fetch the job board pages needed to reach the finder's limit."""
+        def lost(page, e):
+            print(f"\u274c Arbeitnow page {page} lost: {e}")
+            self.stats.record_error("arbeitnow", e)
+
+        # The page size is learned from the first page rather than trusted from config
+        until = self._caught_up("arbeitnow", "")
+        records = paginate(self._arbeitnow_page, self._max_pages(config.ARBEITNOW_PAGE_SIZE), on_error=lost,
+                           until=until, stop=self._stop)
+        self._advance_watermark("arbeitnow", "", records, full=until is None)
+        return records
+
+    @_cached_fragment("arbeitnow")
+    def _arbeitnow_page(self, page):
+        """Fetch one Arbeitnow job board page."""
+        resp = self._get("arbeitnow", config.ARBEITNOW_API_URL, params={"page": page}, priority=page)
+        resp.raise_for_status()
+        return [JobRecord(
+            description=job.get("title", ""),
+            link=job.get("url", ""),
+            location=job.get("location", ""),
+            published_at=job.get("published_at", ""),  # Assuming the field is named 'published_at'
+            source="arbeitnow",
+            company=job.get("company_name", ""),
+        ) for job in resp.json().get("data", [])]
 
     def _fetch_remoteok(self):
         """
         Fetch job listings from the RemoteOK API.
         """
-        url = "https://remoteok.com/api"
+        self._raw.extend(self._ingest(self._remoteok_page()))
+
+    @_cached_fragment("remoteok")
+    def _remoteok_page(self):
+        """Fetch the full RemoteOK board in a single request."""
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers)
+        resp = self._get("remoteok", config.REMOTEOK_API_URL, headers=headers)
         resp.raise_for_status()
         data = resp.json()[1:]
-        for item in data:
-            self._raw.append({
-                "Description": item.get("position", ""),
-                "Link": item.get("url", ""),
-                "Published At": item.get("date", ""),
-                "Full Description": item.get("description", "")
-            })
-
-
-
-
-
-
-
-
-
+        records = [JobRecord(
+            description=item.get("position", ""),
+            link=item.get("url", ""),
+            published_at=item.get("date", ""),
+            full_description=item.get("description", ""),
+            source="remoteok",
+            company=item.get("company", ""),
+        ) for item in data]
+        self._advance_watermark("remoteok", "", records, full=True)
+        return records
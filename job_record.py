@@ -0,0 +1,174 @@
+import sys
+import zlib
+from datetime import datetime, timezone
+
+import config
+
+# Raw deflate with a small window: descriptions are short, so this is much cheaper than zlib defaults
+_WBITS = -12
+_MEM_LEVEL = 2
+
+
+def _compress(text):
+    compressor = zlib.compressobj(1, zlib.DEFLATED, _WBITS, _MEM_LEVEL)
+    return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+
+# Timestamp given to postings whose date is missing or unparsable, so they sort as oldest
+MIN_TIMESTAMP = datetime.min.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def parse_timestamp(value):
+    """
+    Normalize a published date from any source to a UTC epoch timestamp.
+
+    Handles ISO 8601 with or without 'Z'/offset (Remotive, Adzuna, RemoteOK, Airtable createdTime;
+    naive values are taken as UTC) and epoch seconds or milliseconds, as numbers or digit strings
+    (Arbeitnow, RemoteOK).
+
+    Returns:
+        float: Seconds since the epoch, or MIN_TIMESTAMP if the value can't be parsed.
+    """
+    if isinstance(value, bool) or value is None:
+        return MIN_TIMESTAMP
+    if isinstance(value, (int, float)):
+        # Anything this large is milliseconds rather than seconds
+        return value / 1000 if value > 1e11 else float(value)
+    if not isinstance(value, str):
+        return MIN_TIMESTAMP
+
+    value = value.strip()
+    if value.isdigit():
+        return parse_timestamp(int(value))
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return MIN_TIMESTAMP
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class JobRecord:
+    """
+    Compact representation of a single job posting, produced by every fetcher.
+
+    Uses __slots__ instead of a per-posting dict, interns the highly repetitive location and
+    source/company strings, and keeps long full descriptions deflate-compressed until they are read. The
+    published date is normalized to a UTC timestamp once, at ingestion.
+    Records expose the same keys as the original dicts through get()/[] so every pipeline stage can
+    pass them through unchanged.
+    """
+
+    __slots__ = ("description", "link", "location", "published_at", "published_ts", "company", "source",
+                 "_full_description")
+
+    # Public (export) key -> attribute
+    FIELDS = {
+        "Description": "description",
+        "Link": "link",
+        "Location": "location",
+        "Published At": "published_at",
+        "Full Description": "full_description",
+        "Company": "company",
+    }
+
+    def __init__(self, description="", link="", location="", published_at="", full_description="", source="",
+                 company=""):
+        self.description = description
+        self.link = link
+        self.location = _intern(location)
+        self.published_at = published_at
+        self.published_ts = parse_timestamp(published_at)
+        self.company = _intern(company)
+        self.source = _intern(source)
+        if isinstance(full_description, str) and len(full_description) >= config.DESCRIPTION_COMPRESS_MIN_CHARS:
+            self._full_description = _compress(full_description)
+        else:
+            self._full_description = full_description
+
+    @property
+    def full_description(self):
+        """The full description, decompressed on access."""
+        value = self._full_description
+        if isinstance(value, bytes):
+            return zlib.decompress(value, _WBITS).decode("utf-8")
+        return value
+
+    def get(self, key, default=None):
+        attr = self.FIELDS.get(key)
+        if attr is None:
+            return default
+        value = getattr(self, attr)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        attr = self.FIELDS.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def to_dict(self, fields=None):
+        """Materialize the record as a plain dict, e.g. for export or JSON caching."""
+        return {key: self.get(key, "") for key in (fields or self.FIELDS)}
+
+    @classmethod
+    def from_dict(cls, data, source=""):
+        return cls(
+            description=data.get("Description", ""),
+            link=data.get("Link", ""),
+            location=data.get("Location", ""),
+            published_at=data.get("Published At", ""),
+            full_description=data.get("Full Description", ""),
+            source=source,
+            company=data.get("Company", ""),
+        )
+
+    def __repr__(self):
+        return f"JobRecord({self.source!r}, {self.description!r}, {self.link!r})"
+
+
+class MatchedJob:
+    """
+    A JobRecord that passed filtering, plus the keywords it matched.
+
+    Wraps the record instead of copying it, so the (possibly compressed) full description is still
+    stored only once.
+    """
+
+    __slots__ = ("record", "keyword", "secondary_keyword")
+
+    def __init__(self, record, keyword, secondary_keyword):
+        self.record = record
+        self.keyword = keyword
+        self.secondary_keyword = secondary_keyword
+
+    @property
+    def published_ts(self):
+        return getattr(self.record, "published_ts", None)
+
+    def get(self, key, default=None):
+        if key == "Keyword":
+            return self.keyword
+        if key == "Secondary Keyword":
+            return self.secondary_keyword
+        return self.record.get(key, default)
+
+    def __getitem__(self, key):
+        if key == "Keyword":
+            return self.keyword
+        if key == "Secondary Keyword":
+            return self.secondary_keyword
+        return self.record[key]
+
+    def to_dict(self, fields=None):
+        fields = fields or ("Keyword", "Secondary Keyword", *JobRecord.FIELDS)
+        return {key: self.get(key, "") for key in fields}
+
+    def __repr__(self):
+        return f"MatchedJob({self.keyword!r}, {self.record!r})"
+
@@ -1,41 +1,80 @@
-import csv
+import config
+from dedupe import collapse_near_duplicates
+from exporters import EXPORT_FIELDS, ExportRow, export  # EXPORT_FIELDS kept importable from here
 from job_finder import JobFinder
-from cache_utils import get_cache_key, load_cache, save_cache
+from job_store import JobStore
+from run_stats import RunStats
 
-_all__ = ["job_scanner"]
-
-# Fields to include in the final output
-EXPORT_FIELDS = ["Description", "Link", "Location", "Published At", "Full Description"]
+_all__ = ["job_scanner", "batch_job_scanner"]
 
 
 def _trim_jobs(jobs):
-    """Return jobs with only selected fields."""
-    return [{k: v for k, v in job.items() if k in EXPORT_FIELDS} for job in jobs]
+    """Return jobs as read-only rows with only the export fields (views, not copies)."""
+    return [ExportRow(job) for job in jobs]
 
 
 def _save_to_csv(jobs, filename="jobs.csv"):
-    """Export filtered job listings to a CSV file with predefined columns."""
-    if not jobs:
-        print("No jobs to save.")
-        return
+    """
+    Export job listings with the predefined columns, streaming them straight from the records.
+
+    The format follows the extension: .csv, .csv.gz, .jsonl or .jsonl.gz (see exporters.export).
+    """
     try:
-        with open(filename, "w", newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
-            writer.writeheader()
-            for job in jobs:
-                writer.writerow({h: job.get(h, "") for h in EXPORT_FIELDS})
-        print(f" Saved {len(jobs)} jobs to {filename}")
+        count = export(jobs, filename)
     except PermissionError:
         print("⚠ Could not save CSV. Make sure the file isn't open in Excel.")
+        return
     except Exception as e:
         print(f" Failed to save CSV: {e}")
+        return
+    if count:
+        print(f" Saved {count} jobs to {filename}")
+    else:
+        print("No jobs to save.")
+
+
+def _stream_to_csv(jobs, filename="jobs.csv", on_match=None):
+    """
+    Write job listings as they arrive instead of after the whole result set is built.
+
+    Rows go to a temporary file that replaces `filename` once the stream ends, so readers never
+    see a partial file; `on_match` is how callers get each match immediately.
+
+    Args:
+        jobs (Iterable[Dict]): Stream of matched job entries.
+        filename (str): Output path (.csv, .csv.gz, .jsonl or .jsonl.gz); only written if anything matched.
+                        None skips the export; matches still reach `on_match`.
+        on_match (Callable[[Mapping], None]): Optional callback invoked with each trimmed entry.
+
+    Returns:
+        List[Mapping]: The trimmed entries that were written (read-only rows, see exporters.ExportRow).
+    """
+    written = []
+
+    def tap(jobs):
+        for job in jobs:
+            row = ExportRow(job)
+            written.append(row)
+            if on_match is not None:
+                on_match(row)
+            yield job
+
+    if filename:
+        _save_to_csv(tap(jobs), filename)
+    else:
+        for _ in tap(jobs):
+            pass
+    return written
 
 
-def job_scanner(roles, levels, locations, sort_by="location", limit=100, csv_filename="jobs.csv"):
+def job_scanner(roles, levels, locations, sort_by="location", limit=100, csv_filename="jobs.csv",
+                fetch_mode="threads", store_path=None, offline=False, stream=False, on_match=None,
+                return_stats=False, stats_path=None, top_n=None, near_duplicates=True, budget_seconds=None,
+                source_deadlines=None, hedge_after=None):
     """
     Public interface to run a full job search pipeline:
     - Aggregates job postings from multiple sources
-    - Filters and deduplicates them
+    - Filters and deduplicates them, collapsing the same posting syndicated through several sources
     - Sorts by user-defined preference
     - Saves the result to CSV
 
@@ -43,36 +82,159 @@ def job_scanner(roles, levels, locations, sort_by="location", limit=100, csv_fil
         roles (List[str]): Main role to match in job descriptions.
         levels (List[str]): Additional keywords to refine results. If 'none', defaults to first_keywords.
         locations (List[str]): Preferred locations (e.g., ["israel", "remote"]).
-        sort_by (str): Sorting field — "location", "keyword", or "published at".
+        sort_by (str): Sorting field — "location", "keyword", "published at", or "relevance" (BM25 over
+                       title and full description).
         limit (int): Max jobs to fetch from each source.
+        fetch_mode (str): "threads" (one thread per source) or "async" (every request unit - a single request
+                          or a paginated query - scheduled independently, under a global request cap).
+        store_path (str): Optional SQLite job store; fetched jobs are kept there and queried through its index.
+                          Refreshes are incremental and postings gone for config.STORE_EXPIRE_HOURS are expired.
+        offline (bool): With a store, skip fetching and answer from the stored jobs only.
+        stream (bool): Filter entries as each request completes and write matches to the CSV immediately.
+                       Results are kept in arrival order, so sort_by is not applied.
+        on_match (Callable[[Dict], None]): Optional callback receiving each match as it is found (stream mode).
+        return_stats (bool): Also return the RunStats collected for this scan.
+        top_n (int): Only keep the first N results after sorting (e.g. the newest 50).
+        near_duplicates (bool): Collapse near-duplicate postings across sources, keeping the richest
+                                record (not applied in stream mode).
+        stats_path (str): Optional file to export the run stats to - Prometheus text format if it ends
+                          with '.prom', otherwise one appended JSON line.
+        budget_seconds (float): Overall latency budget for fetching. When it runs out, the scan goes on
+                                with whatever has arrived and sources that came back partial or
+                                missing are reported (not applied in stream mode).
+        source_deadlines (Dict[str, float]): Per-source deadlines in seconds within the budget
+                                             (default: config.SOURCE_DEADLINE_SECONDS).
+        hedge_after (float): Send a duplicate of any request still unanswered after this many seconds
+                             and use the first response (off if None).
 
     Returns:
-        List[Dict]: Final trimmed job entries (also saved to 'jobs.csv').
+        List[Mapping]: Final trimmed job entries as read-only rows over the records (also saved to
+        'jobs.csv'; dict(row) makes a plain copy),
+        or (entries, RunStats) when return_stats is set.
     """
     sort_by = sort_by.strip().lower()
     print("Scanning jobs...")
 
-    finder = JobFinder(roles, levels, locations, limit=limit)
-    raw = finder.get_raw()
+    store = JobStore(store_path) if store_path else None
+    stats = RunStats()
 
-    # Load cached results if available
-    cache_key = get_cache_key(roles, levels, locations, limit)
-    cached = load_cache(cache_key)
+    # Responses are cached per (source, keyword, location, page), so only missing fragments are fetched
+    # With a store, only the delta since the previous run is fetched and merged into it
+    finder = JobFinder(roles, levels, locations, limit=limit, use_cache=True, store=store, stats=stats,
+                       incremental=store is not None, prefilter=True, index=sort_by == "relevance",
+                       hedge_after=hedge_after)
 
-    if cached:
-        print("Using cached data...")
-        finder.set_raw(cached)
+    if stream:
+        with stats.stage("stream"):
+            trimmed = _stream_to_csv(finder.iter_matches(finder.iter_raw()), csv_filename, on_match)
+        _warn_incomplete(stats)
+        print(f"{len(trimmed)} jobs matched your criteria.")
     else:
-        finder.aggregate()
-        save_cache(cache_key, raw)
+        if not (offline and store):
+            with stats.stage("fetch"):
+                finder.aggregate(mode=fetch_mode, budget=budget_seconds, source_deadlines=source_deadlines)
+            _warn_incomplete(stats)
+            if store is not None:
+                store.expire()
 
-    # Filter and sort
-    matched = finder.filter_and_dedupe()
+        trimmed = _filter_sort_export(finder, roles, locations, sort_by, top_n, near_duplicates, csv_filename,
+                                      stats)
 
-    sort_preferences = locations if sort_by == "location" else roles
-    matched = JobFinder.sort_by_preference(matched, sort_by, sort_preferences)
+    if store is not None:
+        store.close()
+
+    _export_stats(stats, stats_path)
+    return (trimmed, stats) if return_stats else trimmed
+
+
+def batch_job_scanner(profiles, sort_by="location", limit=100, csv_filename="jobs_{index}.csv",
+                      max_concurrency=None, return_stats=False, stats_path=None, top_n=None,
+                      near_duplicates=True):
+    """
+    Run the job search pipeline for many user profiles with a single shared fetch pass.
+
+    The (source, keyword, location, page) requests of all profiles are merged, so each distinct
+    request is sent once no matter how many profiles need it. Every profile is then filtered,
+    sorted and exported on its own over the shared entries.
+
+    Args:
+        profiles (List[Dict]): One dict per profile with "roles", "levels" and "locations", and
+                               optionally "sort_by", "top_n" and "csv_filename" overriding the defaults.
+        sort_by (str): Default sorting field — "location", "keyword", "published at", or "relevance".
+        limit (int): Max jobs to fetch from each source.
+        csv_filename (str): Default CSV path per profile; "{index}" is replaced by the profile's position.
+                            None skips the CSV export.
+        max_concurrency (int): Maximum number of requests in flight at once (default: config.MAX_CONCURRENCY).
+        return_stats (bool): Also return the RunStats collected for the whole batch.
+        stats_path (str): Optional file to export the run stats to (see job_scanner).
+        top_n (int): Default number of results kept per profile after sorting.
+        near_duplicates (bool): Collapse near-duplicate postings across sources, keeping the richest record.
 
-    # Trim results and save to CSV
-    trimmed = _trim_jobs(matched)
-    print(f"{len(trimmed)} jobs matched your criteria.")
-    _save_to_csv(trimmed, csv_filename)
+    Returns:
+        List[List[Mapping]]: Trimmed job entries per profile (read-only rows), in the order of `profiles`,
+        or (results, RunStats) when return_stats is set.
+    """
+    print(f"Scanning jobs for {len(profiles)} profiles...")
+    stats = RunStats()
+
+    finders = [JobFinder(p["roles"], p["levels"], p["locations"], limit=limit, use_cache=True, stats=stats,
+                         prefilter=True, index=p.get("sort_by", sort_by).strip().lower() == "relevance")
+               for p in profiles]
+    with stats.stage("fetch"):
+        requests_sent = JobFinder.aggregate_shared(finders, max_concurrency or config.MAX_CONCURRENCY)
+    print(f"Fetched {requests_sent} distinct requests for {len(profiles)} profiles.")
+    _warn_incomplete(stats)
+
+    results = []
+    for index, (profile, finder) in enumerate(zip(profiles, finders)):
+        filename = profile.get("csv_filename", csv_filename)
+        results.append(_filter_sort_export(
+            finder, profile["roles"], profile["locations"], profile.get("sort_by", sort_by).strip().lower(),
+            profile.get("top_n", top_n), near_duplicates, filename.format(index=index) if filename else None,
+            stats))
+
+    _export_stats(stats, stats_path)
+    return (results, stats) if return_stats else results
+
+
+def _filter_sort_export(finder, roles, locations, sort_by, top_n, near_duplicates, csv_filename, stats):
+    """Filter, collapse, sort and export a finder's fetched entries; returns the trimmed entries."""
+    sort_preferences = locations if sort_by == "location" else roles
+    with stats.stage("filter"):
+        matched = finder.filter_and_dedupe(sort_by, sort_preferences)
+    if near_duplicates:
+        with stats.stage("dedupe"):
+            matched = collapse_near_duplicates(matched)
+
+    if sort_by == "relevance":
+        with stats.stage("sort"):
+            matched = finder.rank_by_relevance(matched, top_n)
+    # The store already returns location/date orderings from its indexed query
+    elif finder.store is None or sort_by not in JobStore.SQL_SORTS:
+        with stats.stage("sort"):
+            matched = JobFinder.sort_by_preference(matched, sort_by, sort_preferences, top_n)
+    elif top_n is not None:
+        matched = matched[:top_n]
+
+    # Save to CSV straight from the records; the results are views over the same records
+    with stats.stage("export"):
+        print(f"{len(matched)} jobs matched your criteria.")
+        if csv_filename:
+            _save_to_csv(matched, csv_filename)
+        return _trim_jobs(matched)
+
+
+def _warn_incomplete(stats):
+    """Print the sources whose results came back partial or missing, if any."""
+    incomplete = stats.incomplete_sources()
+    if incomplete:
+        print("⚠ Incomplete results from: " +
+              ", ".join(f"{source} ({status})" for source, status in incomplete.items()))
+
+
+def _export_stats(stats, stats_path):
+    if stats_path:
+        if stats_path.endswith(".prom"):
+            stats.write_prometheus(stats_path)
+        else:
+            stats.write_jsonl(stats_path)
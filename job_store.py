@@ -0,0 +1,321 @@
+import sqlite3
+import threading
+import time
+
+import config
+from job_record import JobRecord, parse_timestamp
+
+DEFAULT_STORE_PATH = "jobs.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    link TEXT PRIMARY KEY,
+    description TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    location_lc TEXT NOT NULL DEFAULT '',
+    published_at TEXT NOT NULL DEFAULT '',
+    published_ts REAL NOT NULL DEFAULT 0,
+    full_description TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_published_desc ON jobs(published_ts DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+CREATE TABLE IF NOT EXISTS watermarks (
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    newest_ts REAL,
+    full_refresh_at REAL NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (source, query)
+);
+"""
+
+# External-content FTS indexes over the job title and the lowercased location, kept in sync by
+# triggers. The trigram tokenizer gives substring semantics, matching how keywords and locations
+# are matched in JobFinder.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    description, content='jobs', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, description) VALUES (new.rowid, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, description) VALUES ('delete', old.rowid, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF description ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, description) VALUES ('delete', old.rowid, old.description);
+    INSERT INTO jobs_fts(rowid, description) VALUES (new.rowid, new.description);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_location_fts USING fts5(
+    location_lc, content='jobs', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_location_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_location_fts(rowid, location_lc) VALUES (new.rowid, new.location_lc);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_location_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_location_fts(jobs_location_fts, rowid, location_lc) VALUES ('delete', old.rowid, old.location_lc);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_location_au AFTER UPDATE OF location_lc ON jobs
+WHEN old.location_lc <> new.location_lc BEGIN
+    INSERT INTO jobs_location_fts(jobs_location_fts, rowid, location_lc) VALUES ('delete', old.rowid, old.location_lc);
+    INSERT INTO jobs_location_fts(rowid, location_lc) VALUES (new.rowid, new.location_lc);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO jobs (link, description, location, location_lc, published_at, published_ts,
+                  full_description, company, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(link) DO UPDATE SET
+    description = excluded.description,
+    location = excluded.location,
+    location_lc = excluded.location_lc,
+    published_at = excluded.published_at,
+    published_ts = excluded.published_ts,
+    full_description = excluded.full_description,
+    company = excluded.company,
+    last_seen = excluded.last_seen
+"""
+
+# Trigram tokens need at least three characters to be indexed
+_MIN_FTS_TERM = 3
+
+
+def _fts_group(phrases):
+    """
+    Build an FTS5 expression matching any of the given phrases, or None if one of them cannot be
+    expressed with trigrams (in which case the group must not restrict the candidates).
+    The expression is a superset; exact phrase rules are re-checked by the matcher.
+    """
+    terms = []
+    for phrase in phrases:
+        words = [w for w in phrase.split() if len(w) >= _MIN_FTS_TERM]
+        if not words:
+            return None
+        terms.append("(" + " AND ".join('"' + w.replace('"', '""') + '"' for w in words) + ")")
+    return " OR ".join(terms) if terms else None
+
+
+class JobStore:
+    """
+    Persistent SQLite store of job entries keyed by their link.
+
+    Titles and locations are trigram-indexed (FTS5), so keyword and location substring filtering
+    run as index lookups. Date ordering walks an index on the publish time when the store has to
+    be scanned (e.g. a location shorter than a trigram) and otherwise sorts the narrowed
+    candidates; ordering by location preference depends on the query, so it is always a sort over
+    the candidates. Entries are never removed by a refresh, so jobs that dropped off the live APIs
+    stay searchable until expire() drops those not seen for a while. Per-(source, query)
+    watermarks let incremental refreshes stop at postings they have already stored.
+    """
+
+    # Sort modes candidates() can apply in SQL
+    SQL_SORTS = ("published at", "location")
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._stop_refresh = threading.Event()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5/trigram: fall back to location-only pre-filtering
+            self.has_fts = False
+        self._conn.commit()
+
+    def close(self):
+        self.stop_background_refresh()
+        with self._lock:
+            self._conn.close()
+
+    def upsert(self, jobs):
+        """
+        Insert or update job entries, keyed by their 'Link'. Entries without a link are skipped.
+
+        Returns:
+            int: Number of entries written.
+        """
+        now = time.time()
+        rows = []
+        for job in jobs:
+            link = job.get("Link")
+            if not link:
+                continue
+            location = job.get("Location", "") or ""
+            published_at = job.get("Published At", "")
+            rows.append((
+                link,
+                job.get("Description", "") or "",
+                location,
+                location.lower(),
+                str(published_at or ""),
+                parse_timestamp(published_at),
+                job.get("Full Description", "") or "",
+                job.get("Company", "") or "",
+                now,
+                now,
+            ))
+        with self._lock:
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.commit()
+        return len(rows)
+
+    def known_links(self, links):
+        """Return the subset of `links` already stored."""
+        links = list(links)
+        known = set()
+        with self._lock:
+            # Stay below SQLite's default limit on bound parameters
+            for i in range(0, len(links), 500):
+                chunk = links[i:i + 500]
+                sql = f"SELECT link FROM jobs WHERE link IN ({', '.join('?' for _ in chunk)})"
+                known.update(row[0] for row in self._conn.execute(sql, chunk))
+        return known
+
+    def watermark(self, source, query=""):
+        """
+        Return the watermark of a (source, query) pair as a dict with 'newest_ts' (newest published
+        timestamp seen), 'full_refresh_at' and 'updated_at', or None if it was never refreshed.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT newest_ts, full_refresh_at, updated_at FROM watermarks WHERE source = ? AND query = ?",
+                (source, query)).fetchone()
+        if row is None:
+            return None
+        return {"newest_ts": row[0], "full_refresh_at": row[1], "updated_at": row[2]}
+
+    def advance_watermark(self, source, query, newest_ts, full=False):
+        """
+        Raise the newest published timestamp of a (source, query) pair; `full` marks a refresh that
+        walked the whole result set.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO watermarks (source, query, newest_ts, full_refresh_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(source, query) DO UPDATE SET "
+                "newest_ts = max(coalesce(newest_ts, excluded.newest_ts), coalesce(excluded.newest_ts, newest_ts)), "
+                "full_refresh_at = CASE WHEN ? THEN excluded.full_refresh_at ELSE full_refresh_at END, "
+                "updated_at = excluded.updated_at",
+                (source, query, newest_ts, now if full else 0, now, full))
+            self._conn.commit()
+
+    def require_full_refresh(self, source, query=""):
+        """Make the next refresh of a (source, query) pair walk its whole result set (e.g. pages were lost)."""
+        with self._lock:
+            self._conn.execute("UPDATE watermarks SET full_refresh_at = 0 WHERE source = ? AND query = ?",
+                               (source, query))
+            self._conn.commit()
+
+    def expire(self, max_age_hours=config.STORE_EXPIRE_HOURS):
+        """
+        Drop entries not seen by any refresh for `max_age_hours`, i.e. postings that are gone.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        cutoff = time.time() - max_age_hours * 3600
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM jobs WHERE last_seen < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def candidates(self, keywords, secondary_keywords, locations, sort_by=None, preferences=None):
+        """
+        Yield stored entries that may match the query, in the requested order.
+
+        Entries must contain a location substring and - when the FTS indexes are available - the
+        words of at least one primary and one secondary phrase. Locations are looked up in the
+        trigram index unless one of them is shorter than a trigram (e.g. "us"), which needs a
+        scan. The caller still applies the exact phrase rules, so this is a superset of the final
+        matches.
+
+        Args:
+            keywords (List[str]): Primary phrases.
+            secondary_keywords (List[str]): Secondary phrases.
+            locations (List[str]): Normalized location substrings.
+            sort_by (str): "published at" or "location" to order in SQL; anything else keeps insertion order.
+            preferences (List[str]): Location preference order used when sort_by is "location".
+
+        Yields:
+            JobRecord: Stored job entries.
+        """
+        if not locations:
+            return
+
+        if self.has_fts and all(len(location) >= _MIN_FTS_TERM for location in locations):
+            where = ["rowid IN (SELECT rowid FROM jobs_location_fts WHERE jobs_location_fts MATCH ?)"]
+            params = [" OR ".join('"' + location.replace('"', '""') + '"' for location in locations)]
+        else:
+            where = ["(" + " OR ".join("instr(location_lc, ?) > 0" for _ in locations) + ")"]
+            params = list(locations)
+
+        if self.has_fts:
+            for group in (keywords, secondary_keywords):
+                expression = _fts_group(group)
+                if expression is not None:
+                    where.append("rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+                    params.append(expression)
+
+        order = "rowid"
+        if sort_by == "published at":
+            order = "published_ts DESC, rowid"
+        elif sort_by == "location" and preferences:
+            cases = " ".join(f"WHEN instr(location_lc, ?) > 0 THEN {i}" for i in range(len(preferences)))
+            order = f"CASE {cases} ELSE {len(preferences)} END, rowid"
+            params.extend(p.lower() for p in preferences)
+
+        sql = ("SELECT description, link, location, published_at, full_description, company FROM jobs "
+               f"WHERE {' AND '.join(where)} ORDER BY {order}")
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        for description, link, location, published_at, full_description, company in rows:
+            yield JobRecord(description, link, location, published_at, full_description, source="store",
+                            company=company)
+
+    # =============  BACKGROUND REFRESH =============
+
+    def start_background_refresh(self, finder, interval_seconds=15 * 60):
+        """
+        Periodically re-run finder.aggregate() on a daemon thread so the store stays warm, then
+        expire entries that have not been seen for config.STORE_EXPIRE_HOURS.
+        The finder must have this store attached so fetched entries are upserted; create it with
+        incremental=True to only fetch what changed since the previous refresh.
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._stop_refresh.clear()
+
+        def loop():
+            while not self._stop_refresh.is_set():
+                try:
+                    finder.aggregate()
+                    self.expire()
+                except Exception as e:
+                    print(f"❌ Background refresh failed: {e}")
+                self._stop_refresh.wait(interval_seconds)
+
+        self._refresh_thread = threading.Thread(target=loop, name="job-store-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self):
+        self._stop_refresh.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=1)
+            self._refresh_thread = None
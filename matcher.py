@@ -0,0 +1,102 @@
+import re
+from functools import lru_cache
+
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'[.,;:/\-]')
+
+
+def _phrase_pattern(phrase):
+    """
+    Build the regex source for a single phrase together with its literal lead.
+
+    Two-word phrases match the words in order with at most one word in between and no punctuation
+    (e.g. 'cloud engineer' matches 'cloud devops engineer' but not 'cloud, engineer'). Any other
+    phrase falls back to a plain substring match.
+
+    Returns:
+        Tuple[str, str] | None: (regex source, literal text every match starts with), or None if
+        the phrase can never match under these rules.
+    """
+    words = phrase.split()
+    if len(words) != 2:
+        return re.escape(phrase), phrase
+
+    # The gap itself can only hold whitespace and word characters, so punctuation can only come
+    # from the phrase words - such a phrase never satisfies the "no punctuation" rule.
+    if _PUNCTUATION.search(phrase):
+        return None
+
+    word1, word2 = words
+    return r'\b' + re.escape(word1) + r'(?:\s+\w+)?\s+' + re.escape(word2) + r'\b', word1
+
+
+class PhraseMatcher:
+    """
+    Matches many phrases against a text in a single scan.
+
+    The literal lead of every phrase is compiled into one alternation, so a single left-to-right
+    search finds each position where some phrase may start. Only the phrases whose lead is present
+    at that position are then checked with their full pattern.
+    """
+
+    def __init__(self, phrases):
+        """
+        Args:
+            phrases (Iterable[str]): Phrases to match; they are lowercased, stripped and deduplicated.
+        """
+        self.phrases = list(dict.fromkeys(p.lower().strip() for p in phrases))
+
+        by_lead = {}
+        for phrase in self.phrases:
+            compiled = _phrase_pattern(phrase)
+            if compiled is not None:
+                pattern, lead = compiled
+                by_lead.setdefault(lead, []).append((phrase, re.compile(pattern)))
+
+        # The alternation prefers the longest lead, and every shorter lead that also matches at the
+        # same position is a prefix of it, so each lead maps to the patterns of all its prefixes.
+        self._candidates = {
+            lead: [entry for other, entries in by_lead.items() if lead.startswith(other) for entry in entries]
+            for lead in by_lead
+        }
+        leads = sorted(by_lead, key=len, reverse=True)
+        self._scanner = re.compile('|'.join(re.escape(lead) for lead in leads)) if leads else None
+
+    @staticmethod
+    def normalize(text):
+        """Lowercase the text and collapse whitespace runs into single spaces."""
+        return _WHITESPACE.sub(' ', text.lower())
+
+    def find(self, text):
+        """
+        Return the set of phrases found in the given text.
+
+        Args:
+            text (str): Raw text; it is normalized once before scanning.
+
+        Returns:
+            Set[str]: Matching phrases, in their normalized form.
+        """
+        found = set()
+        if self._scanner is None:
+            return found
+
+        text = self.normalize(text)
+        search = self._scanner.search
+        pos = 0
+        while len(found) < len(self.phrases) and pos <= len(text):
+            hit = search(text, pos)
+            if hit is None:
+                break
+            pos = hit.start()
+            for phrase, pattern in self._candidates[hit.group()]:
+                if phrase not in found and pattern.match(text, pos):
+                    found.add(phrase)
+            pos += 1
+        return found
+
+
+@lru_cache(maxsize=128)
+def compile_matcher(phrases):
+    """Return a cached PhraseMatcher for the given tuple of phrases."""
+    return PhraseMatcher(phrases)
@@ -0,0 +1,101 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+
+
+class Page(list):
+    """
+    The entries of one results page, plus the total result count the source reported (if any).
+    Returned by paginate() for a whole walk, `complete` is False if any page was lost or skipped.
+    """
+
+    def __init__(self, entries=(), total=None, complete=True):
+        super().__init__(entries)
+        self.total = total
+        self.complete = complete
+
+
+def paginate(fetch_page, max_pages, page_size=None, window=config.PAGINATION_WINDOW, on_error=None, until=None,
+             stop=None):
+    """
+    Fetch pages 1..max_pages of a paginated source, keeping up to `window` pages in flight.
+
+    Pages are consumed in order. The end of the data is found from, in order of preference, the
+    `total` of a returned Page (e.g. Adzuna's `count`), a page shorter than `page_size` (learned
+    from the first page when not given) or an empty page; pages beyond it that are still queued
+    are cancelled and never sent. With `until`, the first page is fetched alone, since a refresh
+    that is already caught up needs nothing more; the window opens once a page has new entries.
+
+    Args:
+        fetch_page (Callable[[int], List]): Fetches one page by its 1-based number.
+        max_pages (int): Hard ceiling on the number of pages.
+        page_size (int): Expected entries per full page, if known.
+        window (int): Number of pages requested concurrently.
+        on_error (Callable[[int, Exception], None]): Called for a page that failed; the page is
+                                                     skipped. Without it the error is raised.
+        until (Callable[[int, List], bool]): Called with each non-empty page in order; returning
+                                             True makes it the last page (e.g. already-seen postings).
+        stop (threading.Event): Once set, queued pages are cancelled and the pages consumed so far
+                                are returned (e.g. when a latency budget abandons the query).
+
+    Returns:
+        Page: The entries of all pages, in page order; `complete` is False if a page failed or
+        the walk was stopped before its last page.
+    """
+    entries = []
+    complete = True
+    last_page = max_pages
+    futures = {}
+    next_page = 1
+    in_flight = 1 if until is not None else window
+
+    with ThreadPoolExecutor(max_workers=max(1, min(window, max_pages))) as executor:
+        def fill():
+            nonlocal next_page
+            while next_page <= last_page and len(futures) < in_flight:
+                futures[next_page] = executor.submit(fetch_page, next_page)
+                next_page += 1
+
+        fill()
+        page = 1
+        while page <= last_page:
+            if stop is not None and stop.is_set():
+                for queued in futures.values():
+                    queued.cancel()
+                complete = False
+                break
+            future = futures.pop(page)
+            try:
+                results = future.result()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(page, e)
+                results = None
+                complete = False
+
+            if results is not None:
+                total = getattr(results, "total", None)
+                if not results:
+                    last_page = page - 1
+                else:
+                    if page_size is None:
+                        page_size = len(results)
+                    elif len(results) < page_size:
+                        last_page = page
+                    if total is not None:
+                        last_page = min(last_page, max(page, math.ceil(total / page_size)))
+                    entries.extend(results)
+                    if until is not None:
+                        if until(page, results):
+                            last_page = min(last_page, page)
+                        else:
+                            in_flight = window
+
+            for queued in [p for p in futures if p > last_page]:
+                futures.pop(queued).cancel()
+            page += 1
+            fill()
+
+    return Page(entries, complete=complete)
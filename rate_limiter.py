@@ -0,0 +1,116 @@
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlparse
+
+import config
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class HostLimiter:
+    """
+    Request scheduler for a single upstream host.
+
+    Combines a token bucket (steady request rate plus burst) with a cap on requests in flight.
+    The cap adapts AIMD-style: it grows by 1/cap after every healthy response, is halved on a 429
+    and shrinks slightly when latency climbs well above the best seen, so throughput settles just
+    below what the provider tolerates. Waiting requests are admitted lowest priority value first
+    (e.g. page 1 before page 9), FIFO within a priority.
+    """
+
+    def __init__(self, rate, burst, max_in_flight):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.limit = max(1.0, max_in_flight / 2)  # Adaptive in-flight cap, starting at half
+        self.tokens = float(burst)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.min_latency = None
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=0, deadline=None):
+        """
+        Block until this request may be sent.
+
+        Raises TimeoutError if it is still waiting at `deadline` (a time.monotonic() value).
+        """
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if deadline is not None and now >= deadline:
+                        raise TimeoutError("deadline passed while waiting for the host scheduler")
+                    self._refill(now)
+                    timeout = None
+                    if self._waiters[0] == ticket and self.in_flight < int(self.limit):
+                        if now < self.blocked_until:
+                            timeout = self.blocked_until - now
+                        elif self.tokens < 1:
+                            timeout = (1 - self.tokens) / self.rate
+                        else:
+                            heapq.heappop(self._waiters)
+                            self.tokens -= 1
+                            self.in_flight += 1
+                            ticket = None
+                            self._cond.notify_all()
+                            return
+                    if deadline is not None:
+                        timeout = deadline - now if timeout is None else min(timeout, deadline - now)
+                    self._cond.wait(timeout)
+            finally:
+                if ticket is not None:
+                    # Interrupted while waiting: give up the place in the queue
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+
+    def release(self, latency, throttled=False, retry_after=0.0, failed=False):
+        """
+        Record the outcome of a request admitted by acquire().
+
+        Args:
+            latency (float): Seconds the request took, including transport retries.
+            throttled (bool): The host answered 429 at least once.
+            retry_after (float): Seconds the host asked us to wait, if any.
+            failed (bool): The request failed without a response (e.g. connection error).
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if throttled or failed:
+                self.limit = max(1.0, self.limit / 2)
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            else:
+                if self.min_latency is None or latency < self.min_latency:
+                    self.min_latency = latency
+                if latency > max(self.min_latency * config.RATE_LIMIT_LATENCY_FACTOR, config.RATE_LIMIT_LATENCY_FLOOR):
+                    self.limit = max(1.0, self.limit * 0.9)
+                else:
+                    self.limit = min(float(self.max_in_flight), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+def limiter_for(url):
+    """Return the shared HostLimiter for the host of `url`, using config.HOST_RATE_LIMITS."""
+    host = urlparse(url).hostname or ""
+    limiter = _limiters.get(host)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(host)
+            if limiter is None:
+                rate, burst, max_in_flight = config.HOST_RATE_LIMITS.get(host, config.DEFAULT_HOST_RATE_LIMIT)
+                limiter = _limiters[host] = HostLimiter(rate, burst, max_in_flight)
+    return limiter
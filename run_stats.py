@@ -0,0 +1,179 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+
+class SourceStats:
+    """Counters for a single job source."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes_received = 0
+        self.records = 0
+        self.prefiltered = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.last_error = None
+        self.status = None  # "complete", "partial" or "missing" once the fetch finished
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "records": self.records,
+            "prefiltered": self.prefiltered,
+            "errors": self.errors,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "latency_sum_s": round(self.latency_sum, 6),
+            "latency_histogram": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)
+            },
+            "last_error": self.last_error,
+            "status": self.status,
+        }
+
+
+class RunStats:
+    """
+    Thread-safe, structured statistics for one scan: per-source request/cache/error counters with a
+    latency histogram, plus wall time per pipeline stage (fetch, filter, sort, export).
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.sources = {}
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def _source(self, source):
+        stats = self.sources.get(source)
+        if stats is None:
+            stats = self.sources[source] = SourceStats()
+        return stats
+
+    def record_request(self, source, latency, bytes_received=0, retries=0):
+        with self._lock:
+            stats = self._source(source)
+            stats.requests += 1
+            stats.bytes_received += bytes_received
+            stats.retries += retries
+            stats.latency_sum += latency
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    stats.latency_buckets[i] += 1
+                    break
+
+    def record_records(self, source, count):
+        with self._lock:
+            self._source(source).records += count
+
+    def record_prefiltered(self, source, count):
+        with self._lock:
+            self._source(source).prefiltered += count
+
+    def record_cache(self, source, hit):
+        with self._lock:
+            stats = self._source(source)
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    def record_error(self, source, error):
+        with self._lock:
+            stats = self._source(source)
+            stats.errors += 1
+            stats.last_error = str(error)
+
+    def set_source_status(self, source, status):
+        with self._lock:
+            self._source(source).status = status
+
+    def incomplete_sources(self):
+        """Return {source: status} for the sources whose results are partial or missing."""
+        with self._lock:
+            return {name: stats.status for name, stats in self.sources.items()
+                    if stats.status in ("partial", "missing")}
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage; repeated stages accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    # =============  EXPORT =============
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "sources": {name: stats.to_dict() for name, stats in self.sources.items()},
+                "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            }
+
+    def write_jsonl(self, path):
+        """Append this run as one JSON line."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict()) + "\n")
+
+    def to_prometheus(self, prefix="job_scanner"):
+        """Render the stats in the Prometheus text exposition format."""
+        data = self.to_dict()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+        sources = data["sources"]
+        for field, help_text in (("requests", "Upstream requests sent"),
+                                 ("bytes_received", "Response bytes received"),
+                                 ("records", "Job records produced"),
+                                 ("prefiltered", "Job records dropped at ingestion"),
+                                 ("errors", "Failed requests"),
+                                 ("retries", "Transport-level retries"),
+                                 ("cache_hits", "Fragment cache hits"),
+                                 ("cache_misses", "Fragment cache misses")):
+            metric(f"source_{field}_total", "counter", help_text,
+                   [({"source": name}, stats[field]) for name, stats in sources.items()])
+
+        lines.append(f"# HELP {prefix}_request_latency_seconds Upstream request latency")
+        lines.append(f"# TYPE {prefix}_request_latency_seconds histogram")
+        for name, stats in sources.items():
+            cumulative = 0
+            for bound, count in stats["latency_histogram"].items():
+                cumulative += count
+                lines.append(f'{prefix}_request_latency_seconds_bucket{{source="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_request_latency_seconds_sum{{source="{name}"}} {stats["latency_sum_s"]}')
+            lines.append(f'{prefix}_request_latency_seconds_count{{source="{name}"}} {stats["requests"]}')
+
+        metric("source_complete", "gauge", "1 if the source returned complete results in the last fetch",
+               [({"source": name}, int(stats["status"] == "complete"))
+                for name, stats in sources.items() if stats["status"] is not None])
+
+        metric("stage_seconds", "gauge", "Wall time per pipeline stage",
+               [({"stage": name}, seconds) for name, seconds in data["stages"].items()])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
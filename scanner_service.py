@@ -0,0 +1,268 @@
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cache_utils import CACHE_TTL_MINUTES
+from job_finder import JobFinder
+from job_scanner import _filter_sort_export
+from run_stats import RunStats
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _split(value):
+    """Parse a comma separated query-string value into a list of stripped items."""
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+class ScannerService:
+    """
+    Long-lived wrapper around JobFinder that keeps results warm between requests.
+
+    - Results are memoized per normalized query for `ttl_seconds`.
+    - Identical queries arriving while one is being computed share the same computation.
+    - A background thread recomputes recently used queries before they expire, so repeat queries
+      are answered from memory.
+    HTTP sessions and compiled matchers are process-wide and therefore reused automatically.
+    """
+
+    def __init__(self, ttl_seconds=CACHE_TTL_MINUTES * 60, refresh_seconds=None, fetch_mode="async"):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_seconds = refresh_seconds or ttl_seconds * 2 / 3
+        self.fetch_mode = fetch_mode
+
+        self._lock = threading.Lock()
+        self._results = {}  # query key -> (computed_at, jobs)
+        self._in_flight = {}  # query key -> Future
+        self._last_used = {}  # query key -> timestamp, drives background refresh
+        self._latencies = deque(maxlen=1000)
+        self._counters = {"queries": 0, "hits": 0, "coalesced": 0, "computed": 0, "refreshed": 0, "errors": 0}
+        self._started = time.time()
+        self._stop = threading.Event()
+        self._refresh_thread = None
+
+    # =============  QUERIES =============
+
+    @staticmethod
+    def make_key(roles, levels, locations, sort_by="location", limit=100):
+        """Normalize query arguments into a hashable cache key."""
+        norm = lambda items: tuple(i.lower().strip() for i in items)
+        return norm(roles), norm(levels), norm(locations), sort_by.strip().lower(), int(limit)
+
+    def query(self, roles, levels, locations, sort_by="location", limit=100):
+        """
+        Return (jobs, cached) for the query, computing it at most once across concurrent callers.
+        """
+        start = time.perf_counter()
+        key = self.make_key(roles, levels, locations, sort_by, limit)
+        with self._lock:
+            self._counters["queries"] += 1
+            self._last_used[key] = time.time()
+            cached = self._results.get(key)
+            if cached and time.time() - cached[0] < self.ttl_seconds:
+                self._counters["hits"] += 1
+                self._latencies.append(time.perf_counter() - start)
+                return cached[1], True
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self._counters["coalesced"] += 1
+
+        if owner:
+            self._compute_into(key, future)
+        jobs = future.result()
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+        return jobs, False
+
+    def _compute_into(self, key, future):
+        """Compute the query for `key`, publish it to waiters and store it in the result cache."""
+        try:
+            jobs = self._compute(key)
+        except Exception as e:
+            with self._lock:
+                self._counters["errors"] += 1
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._results[key] = (time.time(), jobs)
+            self._counters["computed"] += 1
+            self._in_flight.pop(key, None)
+        future.set_result(jobs)
+
+    def _compute(self, key):
+        # Same filter/dedupe/sort path as job_scanner, so both return the same results for a query
+        roles, levels, locations, sort_by, limit = key
+        stats = RunStats()
+        finder = JobFinder(list(roles), list(levels), list(locations), limit=limit, use_cache=True, stats=stats,
+                           prefilter=True, index=sort_by == "relevance")
+        finder.aggregate(mode=self.fetch_mode)
+        return _filter_sort_export(finder, list(roles), list(locations), sort_by, None, True, None, stats)
+
+    # =============  REFRESH =============
+
+    def refresh(self, key=None):
+        """
+        Recompute one query (or every recently used query) regardless of cache age.
+
+        Returns:
+            int: Number of queries refreshed.
+        """
+        with self._lock:
+            if key is not None:
+                keys = [key]
+            else:
+                cutoff = time.time() - self.ttl_seconds * 4
+                keys = [k for k, used in self._last_used.items() if used >= cutoff]
+                # Forget queries nobody has asked for in a while
+                for k in [k for k, used in self._last_used.items() if used < cutoff]:
+                    self._last_used.pop(k, None)
+                    self._results.pop(k, None)
+
+        refreshed = 0
+        for k in keys:
+            with self._lock:
+                if k in self._in_flight:
+                    continue
+                future = self._in_flight[k] = Future()
+            self._compute_into(k, future)
+            if future.exception() is None:
+                refreshed += 1
+        with self._lock:
+            self._counters["refreshed"] += refreshed
+        return refreshed
+
+    def start_background_refresh(self):
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(self.refresh_seconds):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"❌ Background refresh failed: {e}")
+
+        self._refresh_thread = threading.Thread(target=loop, name="scanner-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # =============  STATS =============
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counters = dict(self._counters)
+            cached_queries = len(self._results)
+            in_flight = len(self._in_flight)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            "uptime_seconds": round(time.time() - self._started, 1),
+            "cached_queries": cached_queries,
+            "in_flight": in_flight,
+            "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99)},
+            **counters,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON endpoints: GET /query, POST /refresh, GET /stats."""
+
+    service = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        # Result rows are read-only views over the records; each is turned into a dict as it is encoded
+        body = json.dumps(payload, default=dict).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _params(self):
+        parsed = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            params.update({k: ",".join(v) if isinstance(v, list) else v for k, v in body.items()})
+        return parsed.path, params
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        try:
+            path, params = self._params()
+            if path == "/query":
+                start = time.perf_counter()
+                jobs, cached = self.service.query(
+                    _split(params.get("roles")),
+                    _split(params.get("levels")) or ["none"],
+                    _split(params.get("locations")),
+                    sort_by=params.get("sort_by", "location"),
+                    limit=int(params.get("limit", 100)),
+                )
+                self._send(200, {"jobs": jobs, "count": len(jobs), "cached": cached,
+                                 "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)})
+            elif path == "/refresh":
+                self._send(200, {"refreshed": self.service.refresh()})
+            elif path == "/stats":
+                self._send(200, self.service.stats())
+            else:
+                self._send(404, {"error": f"Unknown endpoint {path}"})
+        except (ValueError, KeyError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, service=None):
+    """Run the scanner service until interrupted."""
+    service = service or ScannerService()
+    handler = type("Handler", (_Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    service.start_background_refresh()
+    print(f"Job scanner service listening on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the job scanner as a local HTTP/JSON service.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--ttl-minutes", type=float, default=CACHE_TTL_MINUTES)
+    parser.add_argument("--fetch-mode", choices=["threads", "async"], default="async")
+    args = parser.parse_args()
+    serve(args.host, args.port, ScannerService(ttl_seconds=args.ttl_minutes * 60, fetch_mode=args.fetch_mode))
@@ -0,0 +1,114 @@
+import heapq
+import math
+import re
+import threading
+from array import array
+
+import config
+
+_TAGS = re.compile(r'<[^>]+>')
+_TOKENS = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Lowercase word tokens of `text`, with HTML tags stripped."""
+    return _TOKENS.findall(_TAGS.sub(" ", text or "").lower())
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over job titles and full descriptions, scored with BM25.
+
+    Entries are added incrementally (e.g. as pages are ingested); each one is tokenized once and
+    its postings appended to compact per-term arrays. Title terms count `title_weight` times, a
+    simple field weighting so a role named in the title outranks one mentioned in passing.
+    Queries only walk the postings of their own terms, never the whole collection.
+    """
+
+    def __init__(self, k1=config.BM25_K1, b=config.BM25_B, title_weight=config.BM25_TITLE_WEIGHT):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self._postings = {}  # term -> (doc ids, term frequencies)
+        self._doc_len = array("I")
+        self._links = []
+        self._ids = {}
+        self._total_len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._links)
+
+    def __contains__(self, link):
+        return link in self._ids
+
+    def add(self, job):
+        """Index one entry, keyed by its 'Link'. Entries without a link or already indexed are skipped."""
+        link = job.get("Link")
+        if not link or link in self._ids:
+            return
+        tf = {}
+        for term in tokenize(job.get("Description", "")):
+            tf[term] = tf.get(term, 0) + self.title_weight
+        for term in tokenize(job.get("Full Description", "")):
+            tf[term] = tf.get(term, 0) + 1
+        length = sum(tf.values())
+
+        with self._lock:
+            if link in self._ids:
+                return
+            doc = len(self._links)
+            self._ids[link] = doc
+            self._links.append(link)
+            self._doc_len.append(length)
+            self._total_len += length
+            for term, count in tf.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("I"))
+                postings[0].append(doc)
+                postings[1].append(count)
+
+    def add_all(self, jobs):
+        for job in jobs:
+            self.add(job)
+
+    def top_k(self, terms, k=None, links=None):
+        """
+        Score entries against the query terms with BM25 (term-at-a-time over their postings).
+
+        Args:
+            terms (Iterable[str]): Query tokens (see tokenize()).
+            k (int): Number of results to return; all scored entries if None.
+            links (Iterable[str]): Only rank these entries, if given.
+
+        Returns:
+            List[Tuple[str, float]]: (link, score) pairs, best first; entries matching no term are omitted.
+        """
+        with self._lock:
+            count = len(self._links)
+            if not count:
+                return []
+            avg_len = self._total_len / count
+            allowed = None if links is None else {self._ids[link] for link in links if link in self._ids}
+            k1, b, doc_len = self.k1, self.b, self._doc_len
+
+            scores = {}
+            for term in set(terms):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs, tfs = postings
+                idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc, tf in zip(docs, tfs):
+                    if allowed is not None and doc not in allowed:
+                        continue
+                    norm = tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len[doc] / avg_len))
+                    scores[doc] = scores.get(doc, 0.0) + idf * norm
+
+            # Ties keep ingestion order
+            if k is None:
+                best = sorted(scores.items(), key=lambda item: (item[1], -item[0]), reverse=True)
+            else:
+                best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+            return [(self._links[doc], score) for doc, score in best]
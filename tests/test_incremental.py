@@ -0,0 +1,39 @@
+from job_finder import JobFinder
+from job_record import JobRecord
+from job_store import JobStore
+from paginator import Page
+
+
+def _finder(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    return JobFinder(["developer"], ["none"], ["usa"], store=store, incremental=True), store
+
+
+def test_empty_watermark_walks_the_full_result_set(tmp_path):
+    finder, store = _finder(tmp_path)
+    # A full walk that found nothing leaves no newest timestamp to stop at
+    store.advance_watermark("adzuna", "q", None, full=True)
+    assert finder._caught_up("adzuna", "q") is None
+    store.close()
+
+
+def test_until_stops_at_known_or_older_postings(tmp_path):
+    finder, store = _finder(tmp_path)
+    store.advance_watermark("adzuna", "q", JobRecord(published_at="2026-01-01").published_ts, full=True)
+    until = finder._caught_up("adzuna", "q")
+    old = JobRecord(description="Developer", link="https://x/old", published_at="2025-12-01", source="adzuna")
+    new = JobRecord(description="Developer", link="https://x/new", published_at="2026-02-01", source="adzuna")
+    assert until(1, [old]) is True
+    assert until(1, [old, new]) is False
+    store.close()
+
+
+def test_lost_page_forces_a_full_refresh(tmp_path):
+    finder, store = _finder(tmp_path)
+    store.advance_watermark("adzuna", "q", JobRecord(published_at="2026-01-01").published_ts, full=True)
+    fresh = JobRecord(description="Developer", link="https://x/new", published_at="2026-02-01", source="adzuna")
+    finder._advance_watermark("adzuna", "q", Page([fresh], complete=False), full=False)
+    # The watermark doesn't move past the lost page, and the next refresh walks every page
+    assert store.watermark("adzuna", "q")["newest_ts"] == JobRecord(published_at="2026-01-01").published_ts
+    assert finder._caught_up("adzuna", "q") is None
+    store.close()